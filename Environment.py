@@ -1,8 +1,36 @@
 from messages.Message import MasterActionMessage, PlayerActionMessage
-from typing import Any, List, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+import functools
+import os
 import random
+import sys
+
+_NO_WORDS = frozenset()
+
+@functools.lru_cache(maxsize=4)
+def _read_word_list(path: str, mtime: float) -> Tuple[str, ...]:
+    """Words of a word list file; keyed on mtime so an edited file is read again."""
+    with open(path, 'r') as f:
+        return tuple(sys.intern(w) for w in f.read().splitlines())
+
+def _load_word_list(path: str) -> Tuple[str, ...]:
+    return _read_word_list(path, os.path.getmtime(path))
 
 class Environment:
+    teams: int
+    max_words: int
+    guessed_words: List[str]
+    guessed_set: Set[str]
+    guessed_words_log: List[List[dict]]
+    board_set: Set[str]
+    neutral_set: Set[str]
+    team_word_set: Dict[int, FrozenSet[str]]
+    opponent_set: Dict[int, Set[str]]
+    word_owner: Dict[str, int]
+    remaining: Dict[int, int]
+    word_category: Dict[int, Dict[str, str]]
+
     def __init__(self, config):
         # Game state
         if isinstance(config, dict):
@@ -14,87 +42,146 @@ class Environment:
             self.max_words = config.max_words
             word_list_file = config.word_list_file
             
-        self.word_sets = {}
-        self.neutral_words = []
-        self.board = []
+        self._word_sets = {}
+        self._neutral_words = []
+        self._board = []
 
         self.guessed_words = []
-        self.guessed_words_log = {i: [] for i in range(1, self.teams + 1)}
+        self.guessed_set = set()
+        # Indexed by 1-based team id; slot 0 is unused
+        self.guessed_words_log = [[] for _ in range(self.teams + 1)]
+        self._reindex()
 
         # Configuration parameters
         if word_list_file:
-            with open(word_list_file, 'r') as f:
-                word_list = [line.strip() for line in f.readlines()]
-                self._setup_board(word_list)
+            self._setup_board(_load_word_list(word_list_file))
         else:
             if "test_flag" in config and config["test_flag"]:
                 pass  # Skip loading word list in test mode
             else:
                 raise ValueError("No word list provided in config")
 
-    def _setup_board(self, word_list: List[str]):
-        random.shuffle(word_list)
-        self.board = word_list[:self.max_words]
+    # The board layout may also be assigned directly (e.g. by tests), so the
+    # lookup sets are rebuilt whenever one of these is replaced.
+    @property
+    def board(self) -> List[str]:
+        return self._board
+
+    @board.setter
+    def board(self, words: List[str]):
+        self._board = words
+        self._reindex()
+
+    @property
+    def word_sets(self) -> dict:
+        return self._word_sets
+
+    @word_sets.setter
+    def word_sets(self, word_sets: dict):
+        self._word_sets = word_sets
+        self._reindex()
+
+    @property
+    def neutral_words(self) -> List[str]:
+        return self._neutral_words
+
+    @neutral_words.setter
+    def neutral_words(self, words: List[str]):
+        self._neutral_words = words
+        self._reindex()
+
+    def _reindex(self):
+        """Rebuild the set views used for membership tests."""
+        self.board_set = set(self._board)
+        self.neutral_set = set(self._neutral_words)
+        self.team_word_set = {tid: frozenset(ws) for tid, ws in self._word_sets.items()}
+        self.word_owner = {w: tid for tid, ws in self.team_word_set.items() for w in ws}
+        # Unguessed word count per team; a team wins when its count hits zero
+        self.remaining = {tid: len(ws - self.guessed_set) for tid, ws in self.team_word_set.items()}
+        self._player_view = None
+        self._guessed_view = None
+        self._all_team_words = frozenset(self.word_owner)
+        # Read-only views handed out by the state getters
+        self._board_view = tuple(self._board)
+        self._word_sets_view = MappingProxyType({tid: tuple(ws) for tid, ws in self._word_sets.items()})
+        self._neutral_view = tuple(self._neutral_words)
+        # Per-team classification of every board word, so a guess resolves with one lookup.
+        # Board words that are neither the team's nor neutral count against the team.
+        team_ids = set(self.team_word_set) | set(range(1, self.teams + 1))
+        on_board_neutral = self.neutral_set & self.board_set
+        self.opponent_set = {}
+        self.word_category = {}
+        for tid in team_ids:
+            team_words = self.team_word_set.get(tid, _NO_WORDS)
+            self.opponent_set[tid] = self.board_set - team_words - self.neutral_set
+            category = dict.fromkeys(self.opponent_set[tid], "opponent")
+            category.update(dict.fromkeys(on_board_neutral - team_words, "neutral"))
+            category.update(dict.fromkeys(team_words & self.board_set, "correct"))
+            self.word_category[tid] = category
+        # One sweep over word_sets collects every team's opponent words, in word_sets order
+        opponent_words = {tid: [] for tid in team_ids}
+        for owner, ws in self._word_sets.items():
+            for tid, words in opponent_words.items():
+                if tid != owner:
+                    words.extend(ws)
+        self._opponent_words = {tid: tuple(words) for tid, words in opponent_words.items()}
+        # Board words that belong to no team, in board order
+        self._unassigned_words = tuple(w for w in self._board if w not in self._all_team_words)
+
+    # The read-only views can't be copied or pickled; copies rebuild them from the layout
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if not k.endswith("_view")}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reindex()
+
+    def _setup_board(self, word_list: Sequence[str]):
+        # A uniform sample is already in random order, so roles are dealt by slicing it
+        picks = random.sample(word_list, min(self.max_words, len(word_list)))
+        team_slots = 16 if self.teams > 1 else 8
+        self._word_sets[1] = picks[:8]
         if self.teams > 1:
             # Setup for 2 teams
-            board_copy = self.board.copy()
-            random.shuffle(board_copy)
-            self.word_sets[1] = board_copy[:8]
-            self.word_sets[2] = board_copy[8:16]
-            self.neutral_words = [word for word in self.board if word not in self.word_sets[1] and word not in self.word_sets[2]]
+            self._word_sets[2] = picks[8:16]
             # Additional setup for multiple teams can be added here
-        else:
-            board_copy = self.board.copy()
-            random.shuffle(board_copy)
-            self.word_sets[1] = board_copy[:8]
-            self.neutral_words = [word for word in self.board if word not in self.word_sets[1]]
+        self._neutral_words = picks[team_slots:]
+        # Shuffle the board separately so its order does not give away the roles
+        self._board = random.sample(picks, len(picks))
+        self._reindex()
         
     def check_win(self) -> bool:
-        if self.teams > 1:
-            # Check win conditions for multiple teams
-            for team, words in self.word_sets.items():
-                remaining = [w for w in words if w not in self.guessed_words]
-                if len(remaining) == 0:
-                    return True
-        else:
-            # Win if all team words have been guessed
-            remaining = [w for w in self.word_sets[1] if w not in self.guessed_words]
-            return len(remaining) == 0
-        return False
+        return any(r == 0 for r in self.remaining.values())
 
     def get_winner(self) -> int:
-        if self.teams > 1:
-            for team, words in self.word_sets.items():
-                remaining = [w for w in words if w not in self.guessed_words]
-                if len(remaining) == 0:
-                    return team
-        else:
-            remaining = [w for w in self.word_sets[1] if w not in self.guessed_words]
-            if len(remaining) == 0:
-                return 1
-        return -1
+        return next((team for team, r in self.remaining.items() if r == 0), -1)
     
     def get_master_state(self, team_id: int = 1) -> dict:
-        if team_id not in self.word_sets:
-            # Ensure safe fallback for backward compatibility if team_id depends on incomplete init
-            if self.teams == 1 and team_id == 1 and 1 not in self.word_sets:
-                 # Should have been initialized, but if manually setting up board...
-                 pass
-            else:
-                 raise ValueError(f"Invalid team id {team_id}. Available: {list(self.word_sets.keys())}")
+        # A single-team board that has not been set up yet still answers for team 1
+        if team_id not in self.word_sets and not (self.teams == 1 and team_id == 1):
+            raise ValueError(f"Invalid team id {team_id}. Available: {list(self.word_sets.keys())}")
         
+        if self._guessed_view is None:
+            self._guessed_view = frozenset(self.guessed_set)
         return {
-            "board": self.board,
-            "word_sets": self.word_sets, 
-            "guessed_words": self.guessed_words,
-            "guessed_words_log": self.guessed_words_log.get(team_id, [])
+            "board": self._board_view,
+            "word_sets": self._word_sets_view,
+            "guessed_words": tuple(self.guessed_words),
+            "guessed_words_log": self.guessed_words_log[team_id] if 0 < team_id <= self.teams else [],
+            # Set forms of the above, rebuilt only when the board or the guesses change
+            "guessed_words_set": self._guessed_view,
+            "all_team_words_set": self._all_team_words,
+            "opponent_words": self._opponent_words.get(team_id, ()),
+            "unassigned_words": self._unassigned_words
         }
     
     def get_player_state(self, team_id: int = 1) -> dict:
         """Return the current game state for a player."""
+        if self._player_view is None:
+            self._player_view = [w for w in self.board if w not in self.guessed_set]
         return {
-            "board": [w for w in self.board if w not in self.guessed_words],
-            "guessed_words_log": self.guessed_words_log.get(team_id, [])
+            "board": self._player_view,
+            "guessed_words_log": self.guessed_words_log[team_id] if 0 < team_id <= self.teams else []
         }
     
     def handle_master_action(self, action: MasterActionMessage) -> dict:
@@ -110,35 +197,55 @@ class Environment:
     
     def handle_player_action(self, action: PlayerActionMessage, team_id: int = 1) -> dict:
         """Process player guesses and update game state."""
-        results = []
-        correct_count = 0
+        results: List[dict] = []
+        correct_count: int = 0
+        categories: Dict[str, str] = self.word_category[team_id]
+        guessed_set: Set[str] = self.guessed_set
+        word_owner: Dict[str, int] = self.word_owner
+        remaining: Dict[int, int] = self.remaining
+        team_log: List[dict] = self.guessed_words_log[team_id]
+        guessed_before: int = len(guessed_set)
+        
+        # Interned guesses compare against the interned board words by identity
+        guesses: List[Any] = [sys.intern(g) if type(g) is str else g for g in action.guesses]
         
-        for guess in action.guesses:
-            if guess in self.guessed_words:
+        for guess in guesses:
+            # Anything but a string (e.g. a dict or list from the model's JSON) can't be
+            # on the board, and may not be hashable for the lookups below
+            if not isinstance(guess, str):
+                results.append({"word": guess, "result": "invalid"})
+                continue
+
+            if guess in guessed_set:
                 results.append({"word": guess, "result": "already_guessed"})
                 continue
             
-            if guess not in self.board:
+            # "correct", "neutral" or "opponent"; None for words not on the board
+            result: Optional[str] = categories.get(guess)
+            if result is None:
                 results.append({"word": guess, "result": "invalid"})
                 continue
             
-            result = ""
-            
-            # Check if the guess is correct (team word)
-            is_correct = guess in self.word_sets.get(team_id, [])
-            if is_correct:
+            if result == "correct":
                 correct_count += 1
-                result = "correct"
-            elif guess in self.neutral_words:
-                result = "neutral"
-            else:
-                result = "opponent"
                 
             guess_dict = {"word": guess, "result": result}
             
             results.append(guess_dict)
             self.guessed_words.append(guess)
-            self.guessed_words_log[team_id].append(guess_dict)
+            guessed_set.add(guess)
+            owner = word_owner.get(guess)
+            if owner is not None:
+                remaining[owner] -= 1
+            team_log.append(guess_dict)
+
+            # As in Codenames, the turn ends at the first guess that misses
+            if result != "correct":
+                break
+        
+        if len(guessed_set) != guessed_before:
+            self._player_view = None
+            self._guessed_view = None
         
         return {
             "success": True,
@@ -150,8 +257,8 @@ class Environment:
     def get_game_state(self) -> dict:
         """Return the full game state."""
         return {
-            "board": self.board,
-            "word_sets": self.word_sets,
-            "neutral_words": self.neutral_words,
-            "guessed_words": self.guessed_words
+            "board": self._board_view,
+            "word_sets": self._word_sets_view,
+            "neutral_words": self._neutral_view,
+            "guessed_words": tuple(self.guessed_words)
         }
\ No newline at end of file
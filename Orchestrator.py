@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import asdict, is_dataclass
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import json
+import logging
 import re
+from types import MappingProxyType
 
 import requests
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
+
 from Environment import Environment
 from configs.Configs import OrchestratorConfig
 from messages.Message import MasterStateMessage, PlayerStateMessage, MasterActionMessage, PlayerActionMessage
@@ -12,6 +22,28 @@ from prompts.agent_prompts import format_master_prompt, format_player_prompt
 from Rewards import RewardModule
 from core.CrossTalk import CrossTalkModule
 
+logger = logging.getLogger(__name__)
+
+def _json_default(obj):
+    """Serialize the read-only views returned by the environment state getters."""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps_line(obj) -> bytes:
+    """Encode obj as one compact JSON line."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_json_default).encode() + b"\n"
+
+def _new_team_rewards() -> dict:
+    """Per-step master and player rewards for one team, stored as two packed int columns."""
+    return {"master": array('i'), "player": array('i')}
+
+def _reward_pairs(team_rewards: dict) -> list:
+    """The [master, player] pair per step that run logs store."""
+    return [[m, p] for m, p in zip(team_rewards["master"], team_rewards["player"])]
+
 class Orchestrator:
     def __init__(self, orchestration_config):
         # Support both dictionary and object configuration
@@ -30,9 +62,18 @@ class Orchestrator:
             } for i, team_cfg in enumerate(orchestration_config.team_configs)}
             self.reward_module = RewardModule(orchestration_config.reward_config)
         
-        self.orchestration_log = {}
-        self.reward_log = {i: [] for i in self.teams.keys()}
+        self.orchestration_log: list[dict] = []
+        self.reward_log = {i: _new_team_rewards() for i in self.teams.keys()}
         self.step_count = 0
+        # Board snapshot the per-step "new_guesses" deltas apply to; taken at the first step
+        self._initial_state = None
+        self._guesses_logged = 0
+        self._step_log = None
+        self._keep_steps = True
+        # Set once a step has been written only to the step log, so orchestration_log is incomplete
+        self._steps_dropped = False
+        # Compiled cross-talk graphs per team, with the player models they were built for
+        self._cross_talk = {}
         
         if isinstance(orchestration_config, OrchestratorConfig):
             self.config_dict = orchestration_config.to_dict()
@@ -44,23 +85,17 @@ class Orchestrator:
         env_state = self.environment.get_master_state(team_id)
         
         # Get team words LEFT for the specified master
-        # Note: Environment now ensures 'word_sets' is returned as a dict in get_master_state
-        team_words = [    
+        guessed_words = env_state["guessed_words_set"]
+        team_words = [
             i for i in env_state["word_sets"].get(team_id, [])
-            if i not in env_state["guessed_words"]
+            if i not in guessed_words
         ]
         
         # Determine opponent words (all other teams' words)
-        opponent_words = []
-        for tid, words in env_state["word_sets"].items():
-            if team_id != tid:
-                opponent_words.extend(words)
+        opponent_words = env_state["opponent_words"]
         
         # Neutral words are board words not assigned to any team
-        all_team_words = set()
-        for words in env_state["word_sets"].values():
-            all_team_words.update(words)
-        neutral_words = [w for w in env_state["board"] if w not in all_team_words]
+        neutral_words = env_state["unassigned_words"]
         
         guessed_words_log = env_state["guessed_words_log"]
         
@@ -84,25 +119,20 @@ class Orchestrator:
             "result": result
         }
     
-    def get_player_state(self, hint: dict) -> PlayerStateMessage:
+    def get_player_state(self, hint: dict, team_id: int = 1) -> PlayerStateMessage:
         """Get the current game state formatted for a player."""
-        env_state = self.environment.get_player_state(team_id=1) # Defaulting to 1 for generic call, but see team_step override
+        # Environment.get_player_state always returns both keys
+        env_state = self.environment.get_player_state(team_id)
         
         return PlayerStateMessage(
             hint_word=hint.get("word", ""),
             hint_number=hint.get("number", 0),
-            board=env_state.get("board", []),
-            guessed_words_log=env_state.get("guessed_words_log", [])
+            board=env_state["board"],
+            guessed_words_log=env_state["guessed_words_log"]
         )
         
     def get_player_state_for_team(self, hint: dict, team_id: int) -> PlayerStateMessage:
-        env_state = self.environment.get_player_state(team_id)
-        return PlayerStateMessage(
-            hint_word=hint.get("word", ""),
-            hint_number=hint.get("number", 0),
-            board=env_state.get("board", []),
-            guessed_words_log=env_state.get("guessed_words_log", [])
-        )
+        return self.get_player_state(hint, team_id)
 
     def handle_player_action(self, action: PlayerActionMessage, team_id: int = 1) -> dict:
         """
@@ -116,6 +146,14 @@ class Orchestrator:
             "result": result
         }
     
+    def _cross_talk_module(self, team_id: int) -> CrossTalkModule:
+        """Return the team's cross-talk graph, compiling it only when the player models change."""
+        models = tuple(self.teams[team_id]["player_models"])
+        cached = self._cross_talk.get(team_id)
+        if cached is None or cached[0] != models:
+            cached = self._cross_talk[team_id] = (models, CrossTalkModule(list(models)))
+        return cached[1]
+
     def team_step(self, team_id: int) -> dict:
         error_msg = ""
 
@@ -134,42 +172,42 @@ class Orchestrator:
         try:
             # Query Master
             m_action, m_response = self.teams[team_id]["master_model"].generate_master(m_prompt)
-            print(f"[DEBUG] Team {team_id} Master Response:", m_response)
-            print(f"[DEBUG] Team {team_id} Master Action:", m_action)
+            logger.debug("Team %s Master Response: %s", team_id, m_response)
+            logger.debug("Team %s Master Action: %s", team_id, m_action)
             if m_action is None:
                 error_msg = "Failed to parse master response"
             
             m_result = self.handle_master_action(m_action)
-            print(f"[DEBUG] Team {team_id} Master Result:", m_result)
+            logger.debug("Team %s Master Result: %s", team_id, m_result)
             if not m_result.get("success"):
                 error_msg = f"Master action failed: {m_result}"
             
             # Query Player
             # Use specialized get_player_state_for_team to ensure correct log retrieval
             p_state = self.get_player_state_for_team(m_result["result"]["hint"], team_id)
-            print(f"[DEBUG] Team {team_id} Player State:", p_state)
+            logger.debug("Team %s Player State: %s", team_id, p_state)
             p_prompt = format_player_prompt(p_state)
 
             if len(self.teams[team_id]["player_models"]) == 1:
                 p_action, p_response = self.teams[team_id]["player_models"][0].generate_player_action(p_prompt)
             else:
                 # Multi-player Consensus (utilizing cross-talk)
-                ct_module = CrossTalkModule(self.teams[team_id]["player_models"])
+                ct_module = self._cross_talk_module(team_id)
                 
                 # Extract hint text for prompts
                 hint_data = m_result["result"]["hint"]
                 hint_text = f"{hint_data.get('word', 'UNKNOWN')} {hint_data.get('number', 0)}"
                 
                 p_action, p_response = ct_module.execute(initial_prompt=p_prompt, hint_text=hint_text)
-                print(f"[DEBUG] Team {team_id} Players Response:", p_response)
+                logger.debug("Team %s Players Response: %s", team_id, p_response)
 
             # p_action = self._parse_player_response(p_response)
-            print(f"[DEBUG] Team {team_id} Player Action:", p_action)
+            logger.debug("Team %s Player Action: %s", team_id, p_action)
             if p_action is None:
                 error_msg = "Failed to parse player response"
             
             p_result = self.handle_player_action(p_action, team_id)
-            print(f"[DEBUG] Team {team_id} Player Result:", p_result)
+            logger.debug("Team %s Player Result: %s", team_id, p_result)
         except Exception as e:
             error_msg = str(e)
         
@@ -177,7 +215,6 @@ class Orchestrator:
         return {
             "success": success_flag,
             "error": error_msg,
-            "environment_state": self.environment.get_game_state(),
             
             "master_prompt": m_prompt,
             "master_response": m_response,
@@ -198,23 +235,32 @@ class Orchestrator:
         self.step_count += 1
         overall_log = {}
         for team_id in self.teams.keys():
-            print("[LOG] Team", team_id, "Step", self.step_count)
+            logger.info("Team %s Step %s", team_id, self.step_count)
             team_log = self.team_step(team_id)
             overall_log[team_id] = team_log
         
         return self._finalize_step(overall_log)
     
+    async def astep(self) -> dict:
+        """
+        Awaitable step(), run on a worker thread so the blocking model calls do not stall
+        the event loop. Teams still play in turn order: each team's master and player see
+        the board after the previous team's guesses, so their calls cannot be gathered.
+        """
+        return await asyncio.to_thread(self.step)
+    
     def run_episode(self, limit: int = 10) -> dict:
         """Run the full game until completion."""
-        while not self.environment.check_win() and self.step_count < limit:
-            step_result = self.step()
+        game_over = self.environment.check_win()
+        while not game_over and self.step_count < limit:
+            game_over = self.step()["game_over"]
             
         winner = self.environment.get_winner()
         return {
             "success": True, 
             "winner": winner,
             "complete_log": self.orchestration_log, 
-            "reward_log": self.reward_log, 
+            "reward_log": {i: _reward_pairs(r) for i, r in self.reward_log.items()}, 
             "total_steps": self.step_count
         }
     
@@ -223,39 +269,137 @@ class Orchestrator:
         run_data = {
             "run_id": run_id,
             "config": self.config_dict,
+            "initial_state": self._initial_state,
             "orchestration_log": self.orchestration_log,
-            "reward_log": self.reward_log
+            "reward_log": {i: _reward_pairs(r) for i, r in self.reward_log.items()}
         }
-        with open(filepath, 'w') as f:
-            json.dump(run_data, f, indent=4)
+        if orjson is not None:
+            # One C-encoded blob instead of the stdlib's incremental pure-Python indenting encoder
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(run_data, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return
+        # Same layout as the orjson path: two-space indent, non-ASCII text written as-is
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(run_data, f, indent=2, ensure_ascii=False, default=_json_default)
+
+    def open_step_log(self, filepath: str, keep_steps: bool = True) -> None:
+        """
+        Append every finalized step to filepath as one JSON line (NDJSON).
+        With keep_steps=False the steps are only written there and no longer kept in
+        orchestration_log, so long runs do not hold every prompt and response in memory.
+        """
+        self.close_step_log()
+        self._step_log = open(filepath, 'ab')
+        self._keep_steps = keep_steps
+        self._write_step_log_header()
+
+    def _write_step_log_header(self) -> None:
+        # Header line with the full state, so the deltas that follow can be replayed
+        self._step_log.write(_dumps_line({"step": self.step_count, "state": self.environment.get_game_state()}))
+
+    def close_step_log(self) -> None:
+        if self._step_log is not None:
+            self._step_log.close()
+            self._step_log = None
+        self._keep_steps = True
 
     def reset(self) -> None:
         """Reset the orchestrator for a new episode."""
         self.environment = Environment(self.config_dict.get("env_config"))
-        self.orchestration_log = {}
-        self.reward_log = {i: [] for i in self.teams.keys()}
+        self.orchestration_log = []
+        self.reward_log = {i: _new_team_rewards() for i in self.teams.keys()}
         self.step_count = 0
+        self._initial_state = None
+        self._guesses_logged = 0
+        self._steps_dropped = False
+        if self._step_log is not None:
+            # The next game's deltas apply to its own board, not the previous one
+            self._write_step_log_header()
+
+    def reconstruct_state(self, step: int) -> dict:
+        """Rebuild the get_game_state() snapshot at the end of a step from the logged deltas."""
+        if self._steps_dropped:
+            raise RuntimeError("Steps were logged with keep_steps=False; replay them from the step log file")
+        if self._initial_state is None:
+            return self.environment.get_game_state()
+        guessed = list(self._initial_state["guessed_words"])
+        for event in self.orchestration_log:
+            if event["step"] > step:
+                break
+            guessed.extend(event["new_guesses"])
+        return {**self._initial_state, "guessed_words": tuple(guessed)}
 
     def _finalize_step(self, team_logs) -> dict:
+        guessed_words = self.environment.guessed_words
+        if self._initial_state is None:
+            # The board layout never changes mid-game, only which words are revealed
+            self._initial_state = {
+                **self.environment.get_game_state(),
+                "guessed_words": tuple(guessed_words[:self._guesses_logged])
+            }
         
         log_event = {
             "step": self.step_count,
-            "environment_state": self.environment.get_game_state(),
+            # Words revealed during this step, in order; see reconstruct_state
+            "new_guesses": guessed_words[self._guesses_logged:],
             "game_over": self.environment.check_win(),
             "team_logs": team_logs
         }
+        self._guesses_logged = len(guessed_words)
         
-        self.orchestration_log[self.step_count] = log_event
-        for i in team_logs.keys():
-            master_reward, player_reward = 0, 0
-            try:
-                master_reward, player_reward = self.reward_module.reward_function(team_logs[i])
-            except Exception:
-                pass
-            
+        if self._keep_steps:
+            self.orchestration_log.append(log_event)
+        else:
+            self._steps_dropped = True
+        if self._step_log is not None:
+            self._step_log.write(_dumps_line(log_event))
+        rewards = self._score_team_logs(list(team_logs.values()))
+        reward_log = self.reward_log
+        for i, (master_reward, player_reward) in zip(team_logs, rewards):
+            team_rewards = reward_log.get(i)
             # Ensure reward_log key exists
-            if i not in self.reward_log:
-                self.reward_log[i] = []
-            self.reward_log[i].append((master_reward, player_reward))
+            if team_rewards is None:
+                team_rewards = reward_log[i] = _new_team_rewards()
+            team_rewards["master"].append(master_reward)
+            team_rewards["player"].append(player_reward)
                 
         return log_event
+
+    def _score_team_logs(self, events: list) -> list:
+        """Score all of a step's team logs, in one batch when the reward module supports it."""
+        # The logs no longer carry the board; it is the same for every step of the game
+        board = self._initial_state["board"]
+        batch = getattr(self.reward_module, "reward_function_batch", None)
+        if batch is not None:
+            return batch(events, board)
+        return [self.reward_module.reward_function(event, board) for event in events]
+
+
+def _map_games(fn, orchestrators: list[Orchestrator], max_workers: int | None) -> list:
+    """
+    Call fn on every orchestrator from one thread pool and return the results in input order.
+    Games only overlap with each other; a game's own teams always play in turn order.
+    max_workers=None uses ThreadPoolExecutor's default pool size.
+    """
+    if not orchestrators:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(fn, orchestrators))
+
+
+def step_batch(orchestrators: list[Orchestrator], max_workers: int | None = None) -> list[dict | None]:
+    """
+    Advance every unfinished game by one step, with the games' model calls in flight together.
+    Returns the step logs in input order, with None for games that were already over.
+    """
+    return _map_games(lambda o: None if o.environment.check_win() else o.step(), orchestrators, max_workers)
+
+
+def run_episodes(orchestrators: list[Orchestrator], limit: int = 10, max_workers: int | None = None) -> list[dict]:
+    """Run one episode on each orchestrator concurrently and return their results in order."""
+    return _map_games(lambda o: o.run_episode(limit), orchestrators, max_workers)
+
+
+async def run_episodes_async(orchestrators: list[Orchestrator], limit: int = 10, max_workers: int | None = None) -> list[dict]:
+    """Awaitable run_episodes(), so a batch of games does not stall the event loop."""
+    return await asyncio.to_thread(run_episodes, orchestrators, limit, max_workers)
@@ -1,3 +1,16 @@
+def _well_formed(event) -> bool:
+    """Whether event carries the team_step fields the scorer reads."""
+    return (
+        isinstance(event, dict)
+        and isinstance(event.get("master_result"), dict)
+        and isinstance(event.get("player_result"), dict)
+    )
+
+def _event_board(event):
+    """The board embedded in older team_step logs (under "environment_state"), or None."""
+    env_data = event.get("environment_state")
+    return env_data.get("board") if isinstance(env_data, dict) else None
+
 class RewardModule:
     def __init__(self, reward_config=None):
         if isinstance(reward_config, dict):
@@ -10,19 +23,54 @@ class RewardModule:
         self.CORRECT_GUESS_REWARD_WEIGHT = 5
         self.NEUTRAL_GUESS_PENALTY_WEIGHT = 2
         self.OPPONENT_GUESS_PENALTY_WEIGHT = 5
+        self.ALREADY_GUESSED_PENALTY_WEIGHT = 12
+
+        # Player reward per guess result; "invalid" guesses score nothing
+        self._RESULT_SCORES = {
+            "correct": self.CORRECT_GUESS_REWARD_WEIGHT,
+            "neutral": -self.NEUTRAL_GUESS_PENALTY_WEIGHT,
+            "opponent": -self.OPPONENT_GUESS_PENALTY_WEIGHT,
+            "already_guessed": -self.ALREADY_GUESSED_PENALTY_WEIGHT,
+        }
+
+    def reward_function(self, event, board=None):
+        """Score one team_step event; board defaults to the one older logs embed in the event."""
+        # Malformed events score nothing rather than raising
+        if not _well_formed(event):
+            return 0, 0
+        if board is None:
+            board = _event_board(event)
+            if board is None:
+                return 0, 0
+        return self._score(event, set(board))
 
-    def reward_function(self, event):
-        env_data = event.get("environment_state", {})
-        board = env_data.get("board")
+    def reward_function_batch(self, events, board=None):
+        """Score several events in one call; each distinct board is only turned into a set once."""
+        board_sets = {}
+        rewards = []
+        for event in events:
+            if not _well_formed(event):
+                rewards.append((0, 0))
+                continue
+            event_board = board if board is not None else _event_board(event)
+            if event_board is None:
+                rewards.append((0, 0))
+                continue
+            board_set = board_sets.get(id(event_board))
+            if board_set is None:
+                board_set = board_sets[id(event_board)] = set(event_board)
+            rewards.append(self._score(event, board_set))
+        return rewards
 
-        master_result = event.get("master_result", "")
-        player_result = event.get("player_result", "")
+    def _score(self, event, board_set):
+        master_result = event["master_result"]
+        player_result = event["player_result"]
         # Master rewards
         master_reward = 0
         # Format must be correct
         if master_result.get("success") is not True:
             master_reward = self.FORMAT_PENALTY  # Penalty for invalid format
-        elif master_result.get("action", {}).get("hint_word") in set(board):
+        elif master_result.get("action", {}).get("hint_word") in board_set:
             master_reward = self.BOARD_WORD_USE_PENALTY  # Penalty for using board word as hint
         else:
             master_reward = self.VALID_HINT_REWARD  # Small reward for valid hint
@@ -34,15 +82,6 @@ class RewardModule:
         else:
             env_results = player_result.get("result", {})
 
-            for res in env_results.get("results", []):
-                word, result = res.get("word"), res.get("result")
-                
-                if result == "already_guessed":
-                    player_reward -= 12
-                elif result == "correct":
-                    player_reward += self.CORRECT_GUESS_REWARD_WEIGHT
-                elif result == "neutral":
-                    player_reward -= self.NEUTRAL_GUESS_PENALTY_WEIGHT
-                elif result == "opponent":
-                    player_reward -= self.OPPONENT_GUESS_PENALTY_WEIGHT
+            scores = self._RESULT_SCORES
+            player_reward = sum(scores.get(res.get("result"), 0) for res in env_results.get("results", ()))
         return master_reward, player_reward
\ No newline at end of file
@@ -1,6 +1,10 @@
 from dataclasses import asdict, dataclass, is_dataclass
 from models.BenchmarkAgent import BenchmarkAgent
 
+def _agent_config_dict(agent: 'BenchmarkAgent'):
+    config = agent.get_config()
+    return config.to_dict() if hasattr(config, "to_dict") else config
+
 @dataclass
 class OrchestratorConfig:
     team_configs: list['TeamConfig']
@@ -8,6 +12,7 @@ class OrchestratorConfig:
     reward_config: 'RewardConfig'
 
     def to_dict(self):
+        # Built once per orchestrator (Orchestrator.__init__ keeps the result as config_dict)
         env_config = self.env_config
         reward_config = self.reward_config
         return {
@@ -18,27 +23,51 @@ class OrchestratorConfig:
             "env_config": asdict(env_config) if is_dataclass(env_config) else env_config,
             "reward_config": asdict(reward_config) if is_dataclass(reward_config) else reward_config,
         }
-@dataclass
+@dataclass(frozen=True)
 class OpenAIConfig:
     model: str
+    # Number of responses to keep in the agent's prompt cache (0 disables it)
+    cache_size: int = 0
     
     def to_dict(self):
         return {
-            "model": self.model
+            "model": self.model,
+            "cache_size": self.cache_size
         }
 
-@dataclass
+@dataclass(frozen=True)
 class OllamaConfig:
     model: str
     ollama_url: str
+    # Number of responses to keep in the agent's prompt cache (0 disables it)
+    cache_size: int = 0
 
     def to_dict(self):
         return {
             "model": self.model,
-            "ollama_url": self.ollama_url
+            "ollama_url": self.ollama_url,
+            "cache_size": self.cache_size
         }
 
-@dataclass
+@dataclass(frozen=True)
+class VLLMConfig:
+    model: str
+    # Completions endpoint of `vllm serve`, e.g. http://localhost:8000/v1/completions
+    vllm_url: str
+    # vLLM's completions endpoint generates only 16 tokens unless told otherwise
+    max_tokens: int = 4096
+    # Number of responses to keep in the agent's prompt cache (0 disables it)
+    cache_size: int = 0
+
+    def to_dict(self):
+        return {
+            "model": self.model,
+            "vllm_url": self.vllm_url,
+            "max_tokens": self.max_tokens,
+            "cache_size": self.cache_size
+        }
+
+@dataclass(frozen=True)
 class RewardConfig:
     # Penalty for incorrect formatting of both Master and Player actions
     FORMAT_PENALTY: int = -10
@@ -53,7 +82,7 @@ class RewardConfig:
     # Penalty for an opponent guess (For Player)
     OPPONENT_GUESS_PENALTY_WEIGHT: int = 5
 
-@dataclass
+@dataclass(frozen=True)
 class EnvironmentConfig:
     teams: int
     max_words: int
@@ -65,11 +94,7 @@ class TeamConfig:
     player_models: list['BenchmarkAgent']  
     
     def to_dict(self):
-        master_config = self.master_model.get_config()
         return {
-            "master_model": master_config.to_dict() if hasattr(master_config, "to_dict") else master_config,
-            "player_models": [
-                m.get_config().to_dict() if hasattr(m.get_config(), "to_dict") else m.get_config()
-                for m in self.player_models
-            ]
+            "master_model": _agent_config_dict(self.master_model),
+            "player_models": [_agent_config_dict(m) for m in self.player_models]
         }
\ No newline at end of file
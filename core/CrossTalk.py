@@ -2,90 +2,141 @@ from typing import Annotated, TypedDict, List, Dict, Any
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 
-import sys
-import os
-# Add parent directory to path to allow imports when running directly
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from prompts.reasoning_prompts import format_cross_pollination_prompt, format_judge_prompt
 from models.BenchmarkAgent import BenchmarkAgent
 import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-# Helper for reducer
-def merge_dicts(a: Dict, b: Dict) -> Dict:
-    return {**a, **b}
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
 
 class AgentState(TypedDict):
     messages: Annotated[List, add_messages]
-    # responses: key is model_idx, value is { "thought": str, "action": obj, "raw": str }
-    round_1_responses: Annotated[Dict[int, Any], merge_dicts]
-    round_2_responses: Annotated[Dict[int, Any], merge_dicts]
+    # responses: index is model_idx, value is { "action": obj, "raw": str }
+    # Each round's single node writes the whole list, so no reducer is needed
+    round_1_responses: List[Any]
+    round_2_responses: List[Any]
     final_action: Any
     
     # Context data
     initial_prompt: str
     hint_text: str
 
-def create_independent_node(model_idx, model: BenchmarkAgent):
+def run_round(models: List[BenchmarkAgent], prompts: List[str]) -> List[tuple]:
+    """
+    Run prompts[i] on models[i] and return the (action, raw) pairs in order.
+    Distinct models run concurrently; a model listed more than once gets all of its
+    prompts in a single generate_player_actions_batch call.
+    """
+    groups: Dict[int, List[int]] = {}
+    for i, model in enumerate(models):
+        groups.setdefault(id(model), []).append(i)
+
+    results = [None] * len(models)
+
+    def run_group(indices: List[int]):
+        model = models[indices[0]]
+        batch = getattr(model, "generate_player_actions_batch", None)
+        if len(indices) == 1 or batch is None:
+            outputs = [model.generate_player_action(prompts[i]) for i in indices]
+        else:
+            outputs = batch([prompts[i] for i in indices])
+        for i, output in zip(indices, outputs):
+            results[i] = output
+
+    if len(groups) == 1:
+        run_group(next(iter(groups.values())))
+    else:
+        with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+            list(pool.map(run_group, groups.values()))
+    return results
+
+def _as_responses(results: List[tuple]) -> List[Any]:
+    return [
+        {
+            "action": action,
+            "raw": raw_response
+        }
+        for action, raw_response in results
+    ]
+
+def create_independent_node(models: List[BenchmarkAgent]):
     """
-    Node for Round 1: Independent Generation
+    Node for Round 1: Independent Generation, scheduling every model's call at once
     """
     def node(state: AgentState) -> dict:
-        prompt = state["initial_prompt"]
-        # Agents are stateless executors
-        action, raw_response = model.generate_player_action(prompt)
+        # Agents are stateless executors; every model answers the same prompt
+        prompts = [state["initial_prompt"]] * len(models)
         
         # TODO: We need to extract the <THOUGHT> block if possible, or just use the full raw response as "thought"
         # Since the Orchestrator expects parsed actions, we'll store everything.
-        return {
-            "round_1_responses": {
-                model_idx: {
-                    "action": action,
-                    "raw": raw_response
-                }
-            }
-        }
+        return {"round_1_responses": _as_responses(run_round(models, prompts))}
     return node
 
-def create_cross_pollination_node(model_idx, model, total_models):
+def create_cross_pollination_node(models: List[BenchmarkAgent]):
     """
-    Node for Round 2: Cross Pollination
+    Node for Round 2: Cross Pollination, scheduling every model's call at once
     """
     def node(state: AgentState) -> dict:
-        # 1. Gather other thoughts from Round 1
-        my_prev_response = state["round_1_responses"][model_idx]["raw"]
-        
-        others_thoughts = []
-        for i in range(total_models):
-            if i == model_idx: 
-                continue
-            others_thoughts.append(f"Teammate {i+1}:\n{state['round_1_responses'][i]['raw']}")
+        total_models = len(models)
+        round_1 = state["round_1_responses"]
+        # 1. Label every Round 1 answer once; each model then sees all segments but its own
+        segments = [f"Teammate {i+1}:\n{round_1[i]['raw']}" for i in range(total_models)]
+
+        prompts = []
+        for model_idx in range(total_models):
+            my_prev_response = round_1[model_idx]["raw"]
+            teammate_thoughts_text = "\n\n".join(
+                segment for i, segment in enumerate(segments) if i != model_idx
+            )
             
-        teammate_thoughts_text = "\n\n".join(others_thoughts)
-        
-        # 2. Format prompt
-        # We need to parse previous thought from raw response nicely, but for now using raw is fine.
-        # Ideally we'd extract content between <THOUGHT> tags.
-        
-        prompt = format_cross_pollination_prompt(
-            hint=state["hint_text"],
-            previous_thought=my_prev_response,
-            teammate_thoughts=teammate_thoughts_text
-        )
+            # 2. Format prompt
+            # We need to parse previous thought from raw response nicely, but for now using raw is fine.
+            # Ideally we'd extract content between <THOUGHT> tags.
+            prompts.append(format_cross_pollination_prompt(
+                hint=state["hint_text"],
+                previous_thought=my_prev_response,
+                teammate_thoughts=teammate_thoughts_text
+            ))
         
         # 3. Generate
-        action, raw_response = model.generate_player_action(prompt)
-        
-        return {
-            "round_2_responses": {
-                model_idx: {
-                    "action": action,
-                    "raw": raw_response
-                }
-            }
-        }
+        round_2 = _as_responses(run_round(models, prompts))
+        update = {"round_2_responses": round_2}
+
+        # 4. A team with a clear majority needs no judge; route_after_round_2 ends the graph here
+        agreed, votes = majority_action(round_2)
+        if agreed is not None:
+            update["final_action"] = agreed
+            update["messages"] = [f"Majority: {votes} of {total_models} proposals agree on {list(agreed.guesses)}"]
+        return update
     return node
 
+def majority_action(responses: List[Any]):
+    """
+    The action proposed by a strict majority of responses, with its vote count, else (None, 0).
+    Guesses are compared in order (guessing stops at the first miss); unparsed
+    responses count against every proposal.
+    """
+    votes = Counter(
+        tuple(resp["action"].guesses)
+        for resp in responses
+        if resp["action"] is not None and resp["action"].guesses
+    )
+    if not votes:
+        return None, 0
+    top, count = votes.most_common(1)[0]
+    if count * 2 <= len(responses):
+        return None, 0
+    for resp in responses:
+        if resp["action"] is not None and tuple(resp["action"].guesses) == top:
+            return resp["action"], count
+
+def route_after_round_2(state: AgentState) -> str:
+    return "end" if state.get("final_action") is not None else "judge"
+
 def create_judge_node(judge_model, total_models):
     """
     Node for Aggregation: Judge selects best answer
@@ -121,51 +172,49 @@ class CrossTalkModule:
         self.num_models = len(player_models)
         self.workflow = StateGraph(AgentState)
         
-        # Add nodes for Round 1
-        for i, model in enumerate(player_models):
-            node_name = f"model_{i}_r1"
-            self.workflow.add_node(node_name, create_independent_node(i, model))
-            self.workflow.add_edge(START, node_name)
-            
-        # Add nodes for Round 2
-        for i, model in enumerate(player_models):
-            node_name_r2 = f"model_{i}_r2"
-            self.workflow.add_node(node_name_r2, create_cross_pollination_node(i, model, self.num_models))
-            
-        self.workflow.add_node("sync_1", lambda x: x)
-        
-        for i in range(self.num_models):
-            self.workflow.add_edge(f"model_{i}_r1", "sync_1")
-            
-        # From sync_1 to all R2
-        for i in range(self.num_models):
-            self.workflow.add_edge("sync_1", f"model_{i}_r2")
+        # One scheduler node per round issues all of that round's model calls together
+        self.workflow.add_node("round_1", create_independent_node(player_models))
+        self.workflow.add_node("round_2", create_cross_pollination_node(player_models))
+        self.workflow.add_edge(START, "round_1")
+        self.workflow.add_edge("round_1", "round_2")
             
         # Add Judge Node
         # Judge is the LAST model in the list (default)
         judge_model = player_models[-1]
         self.workflow.add_node("judge", create_judge_node(judge_model, self.num_models))
         
-        # Connect all R2 to Judge
-        for i in range(self.num_models):
-            self.workflow.add_edge(f"model_{i}_r2", "judge")
-            
+        self.workflow.add_conditional_edges("round_2", route_after_round_2, {"judge": "judge", "end": END})
         self.workflow.add_edge("judge", END)
         
         self.app = self.workflow.compile()
 
+    def _initial_state(self, initial_prompt: str, hint_text: str) -> dict:
+        return {
+            "round_1_responses": [],
+            "round_2_responses": [],
+            "initial_prompt": initial_prompt,
+            "hint_text": hint_text,
+            "final_action": None,
+            "messages": []
+        }
+
     def execute(self, initial_prompt: str, hint_text: str):
+        # Each round's model calls run concurrently, so a round costs the slowest model, not the sum
         final_state = self.app.invoke(
-            {
-                "round_1_responses": {},
-                "round_2_responses": {},
-                "initial_prompt": initial_prompt,
-                "hint_text": hint_text,
-                "messages": []
-            },
+            self._initial_state(initial_prompt, hint_text),
+            config={"configurable": {"thread_id": "1"}}
+        )
+        return self._collect(final_state)
+
+    async def execute_async(self, initial_prompt: str, hint_text: str):
+        """Awaitable execute(); the blocking model calls run on worker threads, off the event loop."""
+        final_state = await self.app.ainvoke(
+            self._initial_state(initial_prompt, hint_text),
             config={"configurable": {"thread_id": "1"}}
         )
+        return self._collect(final_state)
 
+    def _collect(self, final_state: dict):
         # Return the action object (PlayerActionMessage) and the raw judge text (as p_response)
         judge_message = final_state["messages"][-1] if final_state["messages"] else ""
         
@@ -177,12 +226,15 @@ class CrossTalkModule:
             
         # Construct full log
         full_log = {
-            "round_1": {k: v["raw"] for k, v in final_state["round_1_responses"].items()},
-            "round_2": {k: v["raw"] for k, v in final_state["round_2_responses"].items()},
+            "round_1": {str(i): v["raw"] for i, v in enumerate(final_state["round_1_responses"])},
+            "round_2": {str(i): v["raw"] for i, v in enumerate(final_state["round_2_responses"])},
             "judge_reasoning": judge_text
         }
         
-        return final_state["final_action"], json.dumps(full_log)
+        if orjson is not None:
+            return final_state["final_action"], orjson.dumps(full_log).decode()
+        # Same text as orjson: compact separators, non-ASCII characters as-is
+        return final_state["final_action"], json.dumps(full_log, separators=(",", ":"), ensure_ascii=False)
 
     def get_graph(self):
         try:
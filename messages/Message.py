@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PlayerGuess:
     word: str
     result: str
@@ -12,30 +12,46 @@ class PlayerGuess:
             "result": self.result,
         }
 
-@dataclass
+def _as_guess_log(guessed_words_log) -> tuple[PlayerGuess, ...]:
+    """Freeze a guess log, turning the environment's {"word", "result"} dicts into PlayerGuess records."""
+    return tuple(
+        g if isinstance(g, PlayerGuess) else PlayerGuess(word=g["word"], result=g["result"])
+        for g in guessed_words_log
+    )
+
+# State messages are frozen, with their sequences stored as tuples, so they are
+# hashable and can key the prompt formatter caches.
+@dataclass(frozen=True, slots=True)
 class MasterStateMessage:
-    team_words: list
-    opponent_words: list
-    neutral_words: list
-    guessed_words_log: list[PlayerGuess]
+    team_words: tuple
+    opponent_words: tuple
+    neutral_words: tuple
+    guessed_words_log: tuple[PlayerGuess, ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, "team_words", tuple(self.team_words))
+        object.__setattr__(self, "opponent_words", tuple(self.opponent_words))
+        object.__setattr__(self, "neutral_words", tuple(self.neutral_words))
+        object.__setattr__(self, "guessed_words_log", _as_guess_log(self.guessed_words_log))
 
     def to_dict(self):
         return {
             "team_words": self.team_words,
             "opponent_words": self.opponent_words,
             "neutral_words": self.neutral_words,
-            "guessed_words_log": [
-                g.to_dict() if hasattr(g, "to_dict") else g
-                for g in self.guessed_words_log
-            ],
+            "guessed_words_log": [g.to_dict() for g in self.guessed_words_log],
         }
     
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PlayerStateMessage:
     hint_word: str
     hint_number: int
-    board: list
-    guessed_words_log: list[PlayerGuess]
+    board: tuple
+    guessed_words_log: tuple[PlayerGuess, ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, "board", tuple(self.board))
+        object.__setattr__(self, "guessed_words_log", _as_guess_log(self.guessed_words_log))
 
     def to_dict(self):
         return {
@@ -44,13 +60,10 @@ class PlayerStateMessage:
                 "number": self.hint_number
             },
             "board": self.board,
-            "guessed_words_log": [
-                g.to_dict() if hasattr(g, "to_dict") else g
-                for g in self.guessed_words_log
-            ],
+            "guessed_words_log": [g.to_dict() for g in self.guessed_words_log],
         }
     
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MasterActionMessage:
     hint_word: str
     hint_number: int
@@ -61,7 +74,7 @@ class MasterActionMessage:
             "hint_number": self.hint_number
         }
         
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PlayerActionMessage:
     guesses: list
 
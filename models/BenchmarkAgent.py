@@ -2,6 +2,10 @@ from abc import ABC, abstractmethod
 from messages.Message import MasterActionMessage, PlayerActionMessage, PlayerDiscussionMessage
 
 class BenchmarkAgent(ABC):
+    """
+    One model backend. Implementations must be reentrant: a single instance may fill
+    several team slots and be called from several threads at once.
+    """
   
     def __init__(self):
       pass
@@ -10,6 +14,10 @@ class BenchmarkAgent(ABC):
     def generate_player_action(self, prompt: str) -> tuple[PlayerActionMessage, str]:
       pass
     
+    def generate_player_actions_batch(self, prompts: list[str]) -> list[tuple[PlayerActionMessage, str]]:
+      """generate_player_action for several independent prompts; backends that can batch override this."""
+      return [self.generate_player_action(p) for p in prompts]
+    
     @abstractmethod
     def generate_player_discussion(self, prompt:str, identifier:str, history:list[str]) -> tuple[PlayerDiscussionMessage, str]:
       pass
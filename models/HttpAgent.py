@@ -0,0 +1,172 @@
+from abc import abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import json
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from messages.Message import MasterActionMessage, PlayerActionMessage, PlayerDiscussionMessage
+from models.BenchmarkAgent import BenchmarkAgent
+from models._parsing import parse_master_response, parse_player_discussion, parse_player_response
+
+# Pooled sessions shared by every agent that talks to the same endpoint
+_SESSIONS: dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+def _shared_session(endpoint: str) -> requests.Session:
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(endpoint)
+        if session is None:
+            session = _SESSIONS[endpoint] = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        return session
+
+def close_all_sessions() -> None:
+    """Close every shared session; agents created afterwards open fresh ones."""
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+class HttpAgent(BenchmarkAgent):
+    """
+    Shared behaviour for agents backed by a text-generation endpoint.
+    Subclasses only implement _query; prompting and response parsing live here.
+    """
+
+    def __init__(self, config, endpoint: str):
+        self.config = config
+
+        self.model = config.model
+
+        # Masters and players on the same server reuse one keep-alive connection pool
+        self._session = _shared_session(endpoint)
+
+        # LRU of responses keyed on (model, prompt digest); off unless cache_size is set.
+        # A hit skips sampling, so repeated prompts always get the same response
+        self._cache_size = getattr(config, "cache_size", 0)
+        self._llm_cache: OrderedDict[tuple[str, bytes], str] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Cache misses currently being queried, so identical concurrent prompts share one call
+        self._inflight: dict[tuple[str, bytes], Future] = {}
+
+    def generate_player_action(self, prompt:str) -> tuple[PlayerActionMessage, str]:
+        response = self._cached_query(prompt)
+        return (self._parse_player_response(response), response)
+    
+    def generate_player_actions_batch(self, prompts: list[str]) -> list[tuple[PlayerActionMessage, str]]:
+        return [(self._parse_player_response(r), r) for r in self._query_batch(prompts)]
+    
+    def generate_player_discussion(self, prompt:str, identifier:str, history:list[str]) -> tuple[PlayerDiscussionMessage, str]:
+        response = self._cached_query(prompt)
+        return (self._parse_player_discussion(response), response)
+    
+    def generate_master(self, prompt:str) -> tuple[MasterActionMessage, str]:
+        response = self._cached_query(prompt)
+        return (self._parse_master_response(response), response)
+    
+    def get_config(self):
+        return self.config
+
+    def close(self):
+        """
+        No-op: the connection pool is shared with every other agent on the same endpoint,
+        so it stays open for them. Call close_all_sessions() once all agents are done.
+        """
+
+    def _cached_query(self, prompt: str) -> str:
+        """
+        _query, answered from the response cache when the same prompt was seen before.
+        Identical prompts that miss at the same time wait on a single backend call.
+
+        Cached responses are not resampled: CrossTalk players that share one agent get the
+        same Round 1 prompt, so with the cache on they all give the same Round 1 answer.
+        Give each player its own agent, or leave cache_size at 0, to keep them independent.
+        """
+        if self._cache_size <= 0:
+            return self._query(prompt)
+
+        key = (self.model, hashlib.blake2b(prompt.encode(), digest_size=16).digest())
+        with self._cache_lock:
+            hit = self._llm_cache.get(key)
+            if hit is not None:
+                self._llm_cache.move_to_end(key)
+                return hit
+            pending = self._inflight.get(key)
+            if pending is not None:
+                owner = False
+            else:
+                pending = self._inflight[key] = Future()
+                owner = True
+        if not owner:
+            return pending.result()
+
+        try:
+            response = self._query(prompt)
+        except BaseException as e:
+            with self._cache_lock:
+                del self._inflight[key]
+            pending.set_exception(e)
+            raise
+        with self._cache_lock:
+            del self._inflight[key]
+            # Failures are not cached so a retry goes back to the backend
+            if not response.startswith("Error"):
+                self._llm_cache[key] = response
+                if len(self._llm_cache) > self._cache_size:
+                    self._llm_cache.popitem(last=False)
+        pending.set_result(response)
+        return response
+
+    def save_response_cache(self, filepath: str) -> None:
+        """Write the response cache to filepath, oldest entry first, so a later run can reuse it."""
+        with self._cache_lock:
+            entries = [[model, digest.hex(), response] for (model, digest), response in self._llm_cache.items()]
+        with open(filepath, 'w') as f:
+            json.dump({"entries": entries}, f)
+
+    def load_response_cache(self, filepath: str) -> None:
+        """Merge a cache written by save_response_cache, keeping at most cache_size entries."""
+        if self._cache_size <= 0:
+            return
+        with open(filepath, 'r') as f:
+            entries = json.load(f).get("entries", [])
+        with self._cache_lock:
+            for model, digest, response in entries:
+                key = (model, bytes.fromhex(digest))
+                self._llm_cache[key] = response
+                self._llm_cache.move_to_end(key)
+            while len(self._llm_cache) > self._cache_size:
+                self._llm_cache.popitem(last=False)
+
+    def _query_batch(self, prompts: list[str], max_workers: int = 8) -> list[str]:
+        """
+        Query several prompts at once over the shared session and return the responses in order.
+        Servers that run requests in parallel slots (e.g. Ollama with OLLAMA_NUM_PARALLEL > 1)
+        generate them concurrently on the same loaded model.
+        """
+        if len(prompts) <= 1:
+            return [self._cached_query(p) for p in prompts]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+            return list(pool.map(self._cached_query, prompts))
+
+    @abstractmethod
+    def _query(self, prompt: str) -> str:
+        """Send the prompt to the backend and return the generated text, or an "Error..." string."""
+        pass
+
+    def _parse_master_response(self, response: str) -> MasterActionMessage:
+        """Parse the master's response to extract hint word and number."""
+        return parse_master_response(response)
+
+    def _parse_player_response(self, response: str) -> PlayerActionMessage:
+        """Parse the player's response to extract guesses."""
+        return parse_player_response(response)
+
+    def _parse_player_discussion(self, response: str) -> PlayerDiscussionMessage:
+        """Parse a discussion turn's reasoning and guesses."""
+        return parse_player_discussion(response)
@@ -0,0 +1,61 @@
+import requests
+from configs.Configs import VLLMConfig
+from models.HttpAgent import HttpAgent
+from models._parsing import _json_loads
+
+class VLLMAgent(HttpAgent):
+    """
+    Agent backed by a vLLM server (`vllm serve <model>`), which continuously batches
+    concurrent requests and caches shared prompt prefixes.
+    """
+
+    def __init__(self, config:VLLMConfig):
+        super().__init__(config, config.vllm_url)
+
+        self.vllm_url = config.vllm_url
+        self.max_tokens = config.max_tokens
+
+        print(f"VLLM Model initialized")
+
+    def _payload(self, prompt) -> dict:
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "max_tokens": self.max_tokens,
+            # The parsers ignore everything after the result block, so stop generating there
+            "stop": ["</RESULT>"],
+            "include_stop_str_in_output": True
+        }
+
+    def _query(self, prompt: str) -> str:
+        """Query the vLLM completions endpoint with the given prompt and model."""
+        payload = self._payload(prompt)
+        try:
+            response = self._session.post(self.vllm_url, json=payload, timeout=300)
+            response.raise_for_status()
+            return _json_loads(response.content)["choices"][0]["text"]
+        except requests.exceptions.Timeout:
+            return "Error: Timeout"
+        except requests.exceptions.RequestException as e:
+            return f"Error querying vLLM: {e}"
+        except (KeyError, IndexError, ValueError) as e:
+            return f"Error querying vLLM: unexpected response {e}"
+
+    def _query_batch(self, prompts: list[str], max_workers: int = 8) -> list[str]:
+        """The completions endpoint takes a list of prompts, so send them all in one request."""
+        if len(prompts) <= 1 or self._cache_size > 0:
+            return super()._query_batch(prompts, max_workers)
+        try:
+            response = self._session.post(self.vllm_url, json=self._payload(prompts), timeout=300)
+            response.raise_for_status()
+            choices = _json_loads(response.content)["choices"]
+            texts = [None] * len(prompts)
+            for choice in choices:
+                texts[choice["index"]] = choice["text"]
+            return texts
+        except requests.exceptions.Timeout:
+            return ["Error: Timeout"] * len(prompts)
+        except requests.exceptions.RequestException as e:
+            return [f"Error querying vLLM: {e}"] * len(prompts)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            return [f"Error querying vLLM: unexpected response {e}"] * len(prompts)
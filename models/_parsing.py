@@ -0,0 +1,197 @@
+import json
+import logging
+import re
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional; fall back to the stdlib decoder
+    _json_loads = json.loads
+
+from messages.Message import MasterActionMessage, PlayerActionMessage, PlayerDiscussionMessage
+
+logger = logging.getLogger(__name__)
+
+_RESULT_RE = re.compile(r'<RESULT>(.*?)</RESULT>', re.DOTALL | re.IGNORECASE)
+# Matches: HINT: "apple" NUMBER: 2 Or HINT: apple NUMBER: 2
+_HINT_RE = re.compile(r'HINT:\s*["\']?([\w-]+)["\']?\s*NUMBER:\s*(\d+)', re.IGNORECASE)
+_THOUGHT_RE = re.compile(r'<THOUGHT>(.*?)</THOUGHT>', re.DOTALL | re.IGNORECASE)
+_BLOCK_RES = {"result": _RESULT_RE, "thought": _THOUGHT_RE}
+# Prefixes of the strings the agents' _query methods return when the request fails
+_QUERY_ERROR_PREFIXES = ("Error:", "Error querying")
+
+
+def _object_end(text: str, start: int) -> int:
+    """Return the index of the brace closing the object opened at start, or -1.
+
+    Braces inside string literals are skipped.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for end in range(start, len(text)):
+        c = text[end]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == '\\':
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return end
+    return -1
+
+
+def _guesses_object_at(text: str, key: int):
+    """Return the decoded JSON object that holds the "guesses" key at position key, or None.
+
+    Each "{" before the key is tried as the object's opening brace, nearest first,
+    with the same string-aware forward scan; a brace inside a string literal either
+    closes before the key or fails to decode, so it is passed over.
+    """
+    start = text.rfind('{', 0, key)
+    while start >= 0:
+        end = _object_end(text, start)
+        if end > key:
+            try:
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                data = _json_loads(text[start:end + 1])
+            except json.JSONDecodeError:
+                data = None
+            if isinstance(data, dict) and "guesses" in data:
+                return data
+        start = text.rfind('{', 0, start)
+    return None
+
+
+def _load_guesses_json(text: str):
+    """Return the first decodable JSON object holding a "guesses" key, or None.
+
+    A "guesses" that sits in prose (or whose enclosing braces do not decode)
+    is skipped, and the search moves on to the next occurrence.
+    """
+    key = text.find('"guesses"')
+    while key >= 0:
+        data = _guesses_object_at(text, key)
+        if data is not None:
+            return data
+        key = text.find('"guesses"', key + 1)
+    return None
+
+
+def _search_hint(text: str):
+    """_HINT_RE.search(text), trying the pattern only where a literal "hint:" starts."""
+    lowered = text.lower()
+    # Lowercasing can change the length of some non-ASCII text; let the regex handle those
+    if len(lowered) != len(text):
+        return _HINT_RE.search(text)
+    pos = lowered.find('hint:')
+    while pos >= 0:
+        hint_match = _HINT_RE.match(text, pos)
+        if hint_match is not None:
+            return hint_match
+        pos = lowered.find('hint:', pos + 1)
+    return None
+
+
+def _extract_blocks(response: str, *tags: str) -> tuple:
+    """Return the text inside the first <tag>...</tag> block for each tag (None when missing).
+
+    The response is lowered once and every tag is located with str.find on it, so the
+    cost stays linear even for responses full of unclosed tags.
+    """
+    lowered = response.lower()
+    # Lowercasing can change the length of some non-ASCII text; let the regexes handle those
+    if len(lowered) != len(response):
+        matches = (_BLOCK_RES[tag].search(response) for tag in tags)
+        return tuple(match.group(1) if match else None for match in matches)
+
+    blocks = []
+    for tag in tags:
+        open_tag = f"<{tag}>"
+        start = lowered.find(open_tag)
+        if start < 0:
+            blocks.append(None)
+            continue
+        start += len(open_tag)
+        end = lowered.find(f"</{tag}>", start)
+        blocks.append(response[start:end] if end >= 0 else None)
+    return tuple(blocks)
+
+
+def _extract_result_block(response: str) -> str:
+    """Return the text inside the first <RESULT>...</RESULT> block, or the whole response."""
+    (result_text,) = _extract_blocks(response, "result")
+    return result_text if result_text is not None else response
+
+
+def parse_master_response(response: str) -> MasterActionMessage:
+    """Parse the master's response to extract hint word and number."""
+    if not response or response.startswith(_QUERY_ERROR_PREFIXES):
+        return None
+    # Look for the <RESULT>...</RESULT> block
+    result_text = _extract_result_block(response)
+    
+    hint_match = _search_hint(result_text)
+    if hint_match is None:
+        return None
+    
+    try:
+        hint_number = int(hint_match.group(2))
+    except ValueError as e:
+        # Digit runs longer than int()'s conversion limit
+        logger.warning("Exception during Master parsing: %s", e)
+        return None
+    return MasterActionMessage(
+        hint_word=hint_match.group(1),
+        hint_number=hint_number
+    )
+
+
+def parse_player_response(response: str) -> PlayerActionMessage:
+    """Parse the player's response to extract guesses."""
+    if not response or response.startswith(_QUERY_ERROR_PREFIXES):
+        return None
+    # First, try to find the <RESULT> block
+    result_text = _extract_result_block(response)
+
+    data = _load_guesses_json(result_text)
+    if data is None:
+        # Fallback: try parsing the whole response as JSON
+        try:
+            data = _json_loads(response)
+        except json.JSONDecodeError:
+            return None
+    
+    if not isinstance(data, dict):
+        return None
+    return PlayerActionMessage(guesses=data.get("guesses", []))
+
+
+def parse_player_discussion(response: str) -> PlayerDiscussionMessage:
+    """Parse a discussion turn's reasoning and guesses."""
+    if not response or response.startswith(_QUERY_ERROR_PREFIXES):
+        return None
+    # One pass over the lowered response finds both blocks
+    thought, result_text = _extract_blocks(response, "thought", "result")
+    if thought is None:
+        thought = response
+
+    data = _load_guesses_json(result_text if result_text is not None else response)
+    if data is None:
+        # Fallback: try parsing the whole response as JSON
+        try:
+            data = _json_loads(response)
+        except json.JSONDecodeError:
+            return None
+
+    if not isinstance(data, dict):
+        return None
+    return PlayerDiscussionMessage(response=thought, guesses=data.get("guesses", []))
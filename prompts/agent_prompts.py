@@ -1,13 +1,17 @@
+import functools
 import json
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
 from messages.Message import MasterStateMessage, PlayerStateMessage
 
+# Every fixed section comes before the per-turn {state}, so consecutive prompts share
+# one long prefix that servers with prefix caching (vLLM, Ollama) can reuse.
 CODE_MASTER_SYSTEM = """
 You are a codemaster for the game Codenames. Your task is to help players by providing hints that relate to multiple words on the board while avoiding words that belong to the opposing team or neutral words.
 
-## Current Game State
-The following state information will be provided to you:
-{state}
-
 ## Your Objective
 Generate a hint that connects as many of your team's words as possible without relating to any of the opposing team's or neutral words.
 
@@ -42,15 +46,14 @@ Your output MUST use the following format:
 <RESULT>
 HINT: <hint_word> NUMBER: <number_of_words>
 </RESULT>
+
+## Current Game State
+{state}
 """
 
 CODE_PLAYER_SYSTEM = """
 You are a player in the game Codenames. Your task is to guess the words on the board based on the hint provided by your codemaster.
 
-## Current Game State
-The following state information will be provided to you:
-{state}
-
 ## Your Objective
 Select words from the board that you believe are related to the hint. Aim to select as many words as indicated by the number in the hint.
 
@@ -65,6 +68,7 @@ Select words from the board that you believe are related to the hint. Aim to sel
 - Be cautious not to select words that belong to the opposing team or neutral words.
 - You may choose to guess fewer words than indicated if you're uncertain.
 - Already guessed words cannot be selected again.
+- Guesses are revealed in order, and your turn ends at the first guess that is not one of your team's words.
 - Your final output MUST be valid JSON.
 
 ## Output Format
@@ -86,16 +90,38 @@ Your output MUST be in the following format:
     "guesses": ["guessed_word1", "guessed_word2", ...]
 }}
 </RESULT>
+
+## Current Game State
+{state}
 """
 
 
+def _dumps_state(state_dict: dict) -> str:
+    # Compact JSON: indentation only adds prompt tokens. Both encoders emit non-ASCII
+    # characters as-is, so the prompt text does not depend on whether orjson is installed
+    if orjson is not None:
+        return orjson.dumps(state_dict).decode()
+    return json.dumps(state_dict, separators=(",", ":"), ensure_ascii=False)
+
+
+def _split_template(template: str) -> tuple[str, str]:
+    """Resolve the template's escaped braces once and split it around {state}."""
+    prefix, suffix = template.format(state="\0").split("\0")
+    return prefix, suffix
+
+_MASTER_PREFIX, _MASTER_SUFFIX = _split_template(CODE_MASTER_SYSTEM)
+_PLAYER_PREFIX, _PLAYER_SUFFIX = _split_template(CODE_PLAYER_SYSTEM)
+
+
+@functools.lru_cache(maxsize=1024)
 def format_master_prompt(state: MasterStateMessage) -> str:
     """Format the master prompt with the current game state."""
-    state_json = json.dumps(state.to_dict(), indent=2)
-    return CODE_MASTER_SYSTEM.format(state=state_json)
+    state_json = _dumps_state(state.to_dict())
+    return _MASTER_PREFIX + state_json + _MASTER_SUFFIX
 
 
+@functools.lru_cache(maxsize=1024)
 def format_player_prompt(state: PlayerStateMessage) -> str:
     """Format the player prompt with the current game state."""
-    state_json = json.dumps(state.to_dict(), indent=2)
-    return CODE_PLAYER_SYSTEM.format(state=state_json)
\ No newline at end of file
+    state_json = _dumps_state(state.to_dict())
+    return _PLAYER_PREFIX + state_json + _PLAYER_SUFFIX
@@ -1,13 +1,12 @@
 import json
 from messages.Message import MasterStateMessage, PlayerStateMessage
 
+# Fixed sections come first and the per-call context last, so repeated prompts share
+# a long prefix that servers with prefix caching can reuse.
 REASONING_MASTER_SYSTEM = """
 You are a highly intelligent codemaster for the game Codenames.
 Your goal is to win the game by connecting your team's words with clever, safe hints.
 
-## Game State
-{state}
-
 ## Task
 1. Analyze the board deeply. Identify clear semantic clusters among your team's words.
 2. Check strictly against opponent and neutral words. A hint is INVALID if it relates to any of them.
@@ -25,15 +24,15 @@ Use the following structure:
 <RESULT>
 HINT: <word> NUMBER: <count>
 </RESULT>
+
+## Game State
+{state}
 """
 
 REASONING_PLAYER_SYSTEM = """
 You are a brilliant player in the game Codenames.
 Your goal is to correctly identify your team's words based on the codemaster's hint.
 
-## Game State
-{state}
-
 ## Task
 1. Analyze the hint word and its number. What possible meanings does it have?
 2. Evaluate every visible word on the board against the hint.
@@ -54,6 +53,9 @@ Use the following structure:
     "guesses": ["word1", "word2"...]
 }}
 </RESULT>
+
+## Game State
+{state}
 """
 
 def format_reasoning_master_prompt(state: MasterStateMessage) -> str:
@@ -71,15 +73,6 @@ CONSENSUS_CROSS_POLLINATION_SYSTEM = """
 You are a brilliant player in the game Codenames.
 You have generated an initial guess, but now you have access to the thoughts of your teammates.
 
-## Original Hint
-{hint}
-
-## Your Previous Thought
-{previous_thought}
-
-## Teammate Thoughts
-{teammate_thoughts}
-
 ## Task
 1. Review your teammates' reasoning. Do they see connections you missed? Are their associations stronger?
 2. Re-evaluate your own choices. Are there risks you ignored?
@@ -99,18 +92,21 @@ Use the following structure:
     "guesses": ["word1", "word2"...]
 }}
 </RESULT>
+
+## Original Hint
+{hint}
+
+## Your Previous Thought
+{previous_thought}
+
+## Teammate Thoughts
+{teammate_thoughts}
 """
 
 CONSENSUS_JUDGE_SYSTEM = """
 You are the Lead Judge for a Codenames team.
 Your goal is to make the final decision on which words to guess.
 
-## Original Hint
-{hint}
-
-## Team Proposals
-{team_proposals}
-
 ## Task
 1. Analyze the different proposals from your team.
 2. Identify the most robust and safe reasoning.
@@ -130,6 +126,12 @@ Use the following structure:
     "guesses": ["word1", "word2"...]
 }}
 </RESULT>
+
+## Original Hint
+{hint}
+
+## Team Proposals
+{team_proposals}
 """
 
 def format_cross_pollination_prompt(hint: str, previous_thought: str, teammate_thoughts: str) -> str:
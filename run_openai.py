@@ -1,16 +1,18 @@
-import copy
 from Orchestrator import Orchestrator
 
 from configs.Configs import OpenAIConfig, EnvironmentConfig, OrchestratorConfig, RewardConfig, TeamConfig
 
 from dotenv import load_dotenv
 
+import logging
 import uuid
 import os
 
 from models.OpenAIAgent import OpenAIAgent
 
 load_dotenv()
+# Per-step progress from the orchestrator; use logging.DEBUG to also see prompts and responses
+logging.basicConfig(level=logging.INFO)
 
 api_key = os.environ.get('OPEN_API_KEY')
 
@@ -24,7 +26,8 @@ MODEL = OpenAIAgent(
 
 TEAM_CONFIG = TeamConfig(
     master_model=MODEL,
-    player_models=[copy.copy(MODEL) for _ in range(2)]  # Two players per team
+    # Two players per team; agents are stateless, so both slots share one instance
+    player_models=[MODEL] * 2
 )
 
 ORCHESTRATOR_CONFIG = OrchestratorConfig(
@@ -0,0 +1,110 @@
+import copy
+import importlib
+import json
+
+import pytest
+
+from Orchestrator import Orchestrator
+from Environment import Environment as EnvironmentStandard
+
+# Module attributes holding orjson (or its loader); --no-orjson points them at the stdlib paths.
+# orjson is always installed alongside langgraph, so this is the only way to run the fallbacks.
+_ORJSON_ATTRS = (
+    ("Orchestrator", "orjson", None),
+    ("prompts.agent_prompts", "orjson", None),
+    ("core.CrossTalk", "orjson", None),
+    ("models._parsing", "_json_loads", json.loads),
+    ("models.OllamaAgent", "_json_loads", json.loads),
+    ("models.OpenAIAgent", "_json_loads", json.loads),
+    ("models.VLLMAgent", "_json_loads", json.loads),
+)
+
+def pytest_addoption(parser):
+    parser.addoption("--no-orjson", action="store_true", help="run the suite on the stdlib json fallbacks")
+
+def pytest_configure(config):
+    if config.getoption("--no-orjson"):
+        for module, attr, value in _ORJSON_ATTRS:
+            setattr(importlib.import_module(module), attr, value)
+
+# Environment config per team count
+TEAM_CONFIGS = {
+    1: {"word_list_file": "content/wordlist.txt", "teams": 1, "test_flag": True},
+    2: {"teams": 2, "max_words": 10, "test_flag": True},
+}
+
+# Fixed board layout shared by the scenarios; fixtures hand each test fresh lists
+BOARD_TEMPLATE = ("wheat", "water", "lava", "netherrack", "wood", "door", "iron", "gold", "diamond", "emerald")
+WORD_SETS_TEMPLATE = {
+    1: ("gold", "diamond", "emerald"),
+    2: ("wheat", "water", "lava")
+}
+NEUTRAL_TEMPLATE = ("netherrack", "wood", "door")
+
+def _apply_layout(env, teams):
+    env.board = list(BOARD_TEMPLATE)
+    env.word_sets = {tid: list(WORD_SETS_TEMPLATE[tid]) for tid in range(1, teams + 1)}
+    env.neutral_words = list(NEUTRAL_TEMPLATE)
+    return env
+
+def _use_environment(monkeypatch, env):
+    """Make Orchestrator adopt env instead of building (and discarding) one from its config."""
+    monkeypatch.setattr("Orchestrator.Environment", lambda config: env)
+
+# Environments are built once per module and team count; each test gets its own deep copy
+@pytest.fixture(scope="module")
+def base_envs():
+    return {}
+
+@pytest.fixture
+def scenario(base_envs, monkeypatch):
+    """
+    Factory for a test's game: scenario(teams) returns (env, orch), with the fixed
+    board layout and an orchestrator that plays on env.
+    """
+    def _make(teams):
+        base = base_envs.get(teams)
+        if base is None:
+            base = base_envs[teams] = EnvironmentStandard(TEAM_CONFIGS[teams])
+        env = _apply_layout(copy.deepcopy(base), teams)
+
+        _use_environment(monkeypatch, env)
+        orch = Orchestrator({
+            "env_config": TEAM_CONFIGS[teams],
+            "team_configs": [{"master_model": "mock", "player_models": ["mock"]} for _ in range(teams)]
+        })
+        return env, orch
+    return _make
+
+# Minimal stand-ins for the agents; the orchestrator only calls these two methods
+class StubMaster:
+    __slots__ = ("ret", "calls")
+
+    def __init__(self, ret):
+        self.ret = ret
+        self.calls = 0
+
+    def generate_master(self, *args, **kwargs):
+        self.calls += 1
+        return self.ret
+
+class StubPlayer:
+    __slots__ = ("responses", "calls")
+
+    def __init__(self, responses):
+        self.responses = iter(responses)
+        self.calls = 0
+
+    def generate_player_action(self, *args, **kwargs):
+        self.calls += 1
+        return next(self.responses)
+
+@pytest.fixture
+def mock_team():
+    """
+    Factory for a team's stub models: mock_team(master_return, player_responses)
+    returns (master, players), one player per response sequence.
+    """
+    def _make(master_ret, player_responses):
+        return StubMaster(master_ret), [StubPlayer(responses) for responses in player_responses]
+    return _make
@@ -0,0 +1,20 @@
+import pytest
+
+from core import CrossTalk
+from messages.Message import PlayerActionMessage
+
+
+def test_log_matches_without_orjson(monkeypatch):
+    if CrossTalk.orjson is None:
+        pytest.skip("orjson is not available")
+    module = CrossTalk.CrossTalkModule([object(), object()])
+    final_state = {
+        "messages": ["Judge: café is safer"],
+        "round_1_responses": [{"raw": "Thought: crème"}, {"raw": "Thought: 日本"}],
+        "round_2_responses": [{"raw": "Refined: café"}, {"raw": "Refined: café"}],
+        "final_action": PlayerActionMessage(guesses=["café"]),
+    }
+    _, with_orjson = module._collect(final_state)
+
+    monkeypatch.setattr(CrossTalk, "orjson", None)
+    assert module._collect(final_state)[1] == with_orjson
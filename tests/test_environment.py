@@ -0,0 +1,52 @@
+from Environment import Environment
+from messages.Message import PlayerActionMessage
+
+# Ensure current words and neutral words are disjoint
+def test_neutral_words_disjoint():
+    config = {
+        "teams": 1,
+        "word_list_file": "content/wordlist.txt",
+        "max_words": 25
+    }
+    env = Environment(config)
+    team_words = set(env.word_sets[1])
+    neutral_words = set(env.neutral_words)
+    assert team_words.isdisjoint(neutral_words), "Neutral words overlap with team words"
+
+# Revealing the opponent's last word wins the game for the opponent
+def test_opponent_reveal_counts_toward_win():
+    env = Environment({"teams": 2, "max_words": 10, "test_flag": True})
+    env.board = ["wheat", "water", "lava", "netherrack", "wood", "door", "iron", "gold", "diamond", "emerald"]
+    env.word_sets = {
+        1: ["gold", "diamond"],
+        2: ["wheat", "water"]
+    }
+    env.neutral_words = ["netherrack", "wood", "door"]
+
+    env.handle_player_action(PlayerActionMessage(guesses=["wheat"]), team_id=2)
+    result = env.handle_player_action(PlayerActionMessage(guesses=["water"]), team_id=1)
+
+    assert result["results"] == [{"word": "water", "result": "opponent"}]
+    assert result["game_over"]
+    assert env.get_winner() == 2
+
+# Non-string guesses are invalid and don't interrupt the rest of the turn
+def test_non_string_guesses_are_invalid():
+    env = Environment({"teams": 1, "max_words": 10, "test_flag": True})
+    env.board = ["wheat", "water", "lava", "netherrack", "wood", "door", "iron", "gold", "diamond", "emerald"]
+    env.word_sets = {1: ["gold", "diamond", "emerald"]}
+    env.neutral_words = ["netherrack", "wood", "door"]
+    # Build the cached views before the turn so the test sees them refreshed
+    env.get_player_state(1)
+    env.get_master_state(1)
+
+    result = env.handle_player_action(
+        PlayerActionMessage(guesses=["gold", {"word": "diamond"}, ["emerald"], "diamond"]), team_id=1
+    )
+
+    assert [r["result"] for r in result["results"]] == ["correct", "invalid", "invalid", "correct"]
+    assert result["correct_count"] == 2
+    assert env.guessed_words == ["gold", "diamond"]
+    assert "gold" not in env.get_player_state(1)["board"]
+    assert "diamond" not in env.get_player_state(1)["board"]
+    assert env.get_master_state(1)["guessed_words_set"] == {"gold", "diamond"}
@@ -0,0 +1,87 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from models.HttpAgent import _SESSIONS, HttpAgent, close_all_sessions
+
+
+class CountingAgent(HttpAgent):
+    """HttpAgent whose backend echoes the prompt and counts the calls."""
+
+    def __init__(self, cache_size, gate=None):
+        super().__init__(SimpleNamespace(model="stub", cache_size=cache_size), "http://stub")
+        self.queries = []
+        self.gate = gate
+
+    def _query(self, prompt):
+        self.queries.append(prompt)
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        return f"response to {prompt}"
+
+
+def test_cache_hit_skips_the_backend():
+    agent = CountingAgent(cache_size=2)
+    assert agent._cached_query("a") == agent._cached_query("a") == "response to a"
+    assert agent.queries == ["a"]
+
+
+def test_cache_evicts_least_recently_used():
+    agent = CountingAgent(cache_size=2)
+    for prompt in ("a", "b", "a", "c", "a", "b"):
+        agent._cached_query(prompt)
+    # "b" was the oldest entry when "c" came in; "a" stayed warm
+    assert agent.queries == ["a", "b", "c", "b"]
+
+
+def test_cache_disabled_queries_every_time():
+    agent = CountingAgent(cache_size=0)
+    agent._cached_query("a")
+    agent._cached_query("a")
+    assert agent.queries == ["a", "a"]
+
+
+def test_concurrent_misses_share_one_query():
+    gate = threading.Event()
+    agent = CountingAgent(cache_size=2, gate=gate)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(agent._cached_query("a"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    # Hold the backend until the other threads have had time to find the in-flight query
+    while not agent.queries:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    gate.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert agent.queries == ["a"]
+    assert results == ["response to a"] * 4
+
+
+def test_response_cache_round_trip(tmp_path):
+    path = tmp_path / "cache.json"
+    agent = CountingAgent(cache_size=2)
+    agent._cached_query("a")
+    agent._cached_query("b")
+    agent.save_response_cache(path)
+
+    restored = CountingAgent(cache_size=2)
+    restored.load_response_cache(path)
+    assert restored._cached_query("a") == "response to a"
+    assert restored._cached_query("b") == "response to b"
+    assert restored.queries == []
+
+
+def test_close_keeps_the_shared_session_open():
+    agent = CountingAgent(cache_size=0)
+    other = CountingAgent(cache_size=0)
+    assert agent._session is other._session
+
+    agent.close()
+    assert _SESSIONS.get("http://stub") is other._session
+
+    close_all_sessions()
+    assert "http://stub" not in _SESSIONS
+    assert CountingAgent(cache_size=0)._session is not other._session
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from configs.Configs import OllamaConfig
+from models.OllamaAgent import OllamaModel
+
+
+class FakeStream:
+    """Streamed response that records how many lines were consumed."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, chunk_size=512):
+        for line in self.lines:
+            self.read += 1
+            yield line
+
+
+class FakeSession:
+    def __init__(self, stream):
+        self.stream = stream
+        self.payloads = []
+
+    def post(self, url, json=None, **kwargs):
+        self.payloads.append(json)
+        return self.stream
+
+
+def _chunk(text, done=False):
+    return json.dumps({"response": text, "done": done}).encode()
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """Factory for an OllamaModel whose session serves the given stream lines."""
+    def _make(lines):
+        agent = OllamaModel(OllamaConfig(model="stub", ollama_url="http://stub/api/generate"))
+        session = FakeSession(FakeStream(lines))
+        monkeypatch.setattr(agent, "_session", session)
+        return agent, session
+    return _make
+
+
+def test_stops_at_closing_tag_split_across_chunks(ollama):
+    agent, session = ollama([
+        _chunk("<RESULT>HINT: gold NUMBER: 2</RE"), _chunk("SULT>"), _chunk(" trailing"), _chunk("", done=True)
+    ])
+    assert agent._query("prompt") == "<RESULT>HINT: gold NUMBER: 2</RESULT>"
+    assert session.stream.read == 2
+    assert session.payloads[0]["stream"] is True
+    assert session.payloads[0]["keep_alive"]
+
+
+def test_stops_at_done_chunk(ollama):
+    agent, session = ollama([_chunk("HINT: gold "), b"", _chunk("NUMBER: 2", done=True), _chunk("ignored")])
+    assert agent._query("prompt") == "HINT: gold NUMBER: 2"
+    assert session.stream.read == 3
+
+
+@pytest.mark.parametrize("line", [b"not json", b'{"error": "model not found"}'])
+def test_bad_line_returns_error_string(ollama, line):
+    agent, _ = ollama([_chunk("HINT: "), line])
+    assert agent._query("prompt").startswith("Error querying Ollama")
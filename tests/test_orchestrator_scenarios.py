@@ -1,196 +1,356 @@
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
 
-import sys
-import os
-import unittest
-from unittest.mock import MagicMock, patch
+import pytest
 
-# Adjust path to import from parent directory
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from Orchestrator import Orchestrator
-from Environment import Environment as EnvironmentStandard
 from messages.Message import MasterActionMessage, PlayerActionMessage
+import Orchestrator
+from Orchestrator import run_episodes
 
-class TestOrchestratorStandard(unittest.TestCase):
-    def setUp(self):
-        # 1. Setup Environment with User Configuration
-        config = {"word_list_file": "content/wordlist.txt", "teams": 1, "test_flag": True} 
-        self.env = EnvironmentStandard(config)
-        
-        # Manual override of board state
-        self.env.board = ["wheat", "water", "lava", "netherrack", "wood", "door", "iron", "gold", "diamond", "emerald"]
-        self.env.word_sets = {
-            1: ["gold", "diamond", "emerald"]
-        }
-        self.env.neutral_words = ["netherrack", "wood", "door"]
-        
-        # 2. Setup Orchestrator
-        self.orch = Orchestrator({"env_config": config, "team_configs": [{"master_model": "mock", "player_models": ["mock"]}]})
-        self.orch.environment = self.env
-        
-        # Mock Models
-        self.mock_master = MagicMock()
-        self.mock_player = MagicMock()
-        self.orch.teams[1]["master_model"] = self.mock_master
-        self.orch.teams[1]["player_models"] = [self.mock_player]
-
-    def test_full_step_execution(self):
-        print("\n--- Testing Standard Orchestrator Step ---")
-        
-        # Mock Responses
-        self.mock_master.generate_master.return_value = (
-            MasterActionMessage(hint_word="precious", hint_number=2),
-            "HINT: 'precious' NUMBER: 2"
-        )
-        
-        self.mock_player.generate_player_action.return_value = (
-            PlayerActionMessage(guesses=["gold", "diamond"]),
-            '{"guesses": ["gold", "diamond"]}'
-        )
+# Action messages are frozen, so the scenarios share these instances
+MSG_PRECIOUS_2 = MasterActionMessage(hint_word="precious", hint_number=2)
+MSG_METAL_3 = MasterActionMessage(hint_word="metal", hint_number=3)
+MSG_SHINY_1 = MasterActionMessage(hint_word="shiny", hint_number=1)
+MSG_GOLD = PlayerActionMessage(guesses=["gold"])
+MSG_DIAMOND = PlayerActionMessage(guesses=["diamond"])
+MSG_GOLD_DIAMOND = PlayerActionMessage(guesses=["gold", "diamond"])
+MSG_GOLD_DOOR_DIAMOND = PlayerActionMessage(guesses=["gold", "door", "diamond"])
 
-        step_result = self.orch.step()
-        
-        log_entry = self.orch.orchestration_log[1]
-
-        # Assert specific logs
-        master_prompt = log_entry['team_logs'][1]['master_prompt']
-        self.assertIn("gold", str(master_prompt))
-        self.assertIn("diamond", str(master_prompt))
-        
-        self.assertEqual(log_entry['team_logs'][1]['master_action']['hint_word'], "precious")
-        self.assertEqual(log_entry['team_logs'][1]['master_action']['hint_number'], 2)
-        
-        player_prompt = log_entry['team_logs'][1]['player_prompt']
-        self.assertIn("precious", str(player_prompt))
-        
-        result = step_result['team_logs'][1]['player_result']
-        self.assertEqual(result['result']['correct_count'], 2)
-        self.assertEqual(step_result['team_logs'][1]['success'], True)
-        
-        self.assertIn("gold", self.env.guessed_words)
-        self.assertIn("diamond", self.env.guessed_words)
-
-
-class TestOrchestratorMultiteam(unittest.TestCase):
-    def setUp(self):
-        config = {"teams": 2, "max_words": 10, "test_flag": True}
-        self.env = EnvironmentStandard(config)
-        
-        self.env.board = ["wheat", "water", "lava", "netherrack", "wood", "door", "iron", "gold", "diamond", "emerald"]
-        self.env.word_sets = {
-            1: ["gold", "diamond", "emerald"],
-            2: ["wheat", "water", "lava"]
-        }
-        self.env.neutral_words = ["netherrack", "wood", "door"]
-
-        self.orch = Orchestrator({
-            "env_config": config, 
-            "team_configs": [
-                {"master_model": "mock", "player_models": ["mock"]}, 
-                {"master_model": "mock", "player_models": ["mock"]}
-            ]
-        })
-        self.orch.environment = self.env
-        
-        self.orch.teams[1]["master_model"] = MagicMock()
-        self.orch.teams[1]["player_models"] = [MagicMock()]
-        
-        self.orch.teams[2]["master_model"] = MagicMock()
-        self.orch.teams[2]["player_models"] = [MagicMock()]
-
-    def test_team1_step(self):
-        print("\n--- Testing Multiteam Orchestrator Team 1 ---")
-        
-        mock_master = self.orch.teams[1]["master_model"]
-        mock_player = self.orch.teams[1]["player_models"][0]
-        
-        mock_master.generate_master.return_value = (
-            MasterActionMessage(hint_word="shiny", hint_number=1),
-            "HINT: shiny NUMBER: 1"
-        )
-        mock_player.generate_player_action.return_value = (
-            PlayerActionMessage(guesses=["gold"]),
-            '{"guesses": ["gold"]}'
-        )
-        
-        step_result = self.orch.team_step(1)
-        
-        self.assertEqual(step_result['master_action']['hint_word'], "shiny")
-        self.assertEqual(step_result['player_result']['result']['correct_count'], 1)
-        self.assertIn("gold", self.env.guessed_words)
-
-    def test_team2_step_fail(self):
-        print("\n--- Testing Multiteam Orchestrator Team 2 (Hit Opponent) ---")
-        
-        mock_master = self.orch.teams[2]["master_model"]
-        mock_player = self.orch.teams[2]["player_models"][0]
-        
-        mock_master.generate_master.return_value = (
-            MasterActionMessage(hint_word="liquid", hint_number=2),
-            "HINT: liquid NUMBER: 2"
-        )
-        mock_player.generate_player_action.return_value = (
-            PlayerActionMessage(guesses=["water", "gold"]),
-            '{"guesses": ["water", "gold"]}'
-        )
-        
-        step_result = self.orch.team_step(2)
-        
-        results = step_result['player_result']['result']['results']
-        self.assertEqual(results[0]['word'], "water")
-        self.assertEqual(results[1]['word'], "gold")
-        
-        self.assertIn("water", self.env.guessed_words)
-        self.assertIn("gold", self.env.guessed_words)
-
-    def test_multi_player_consensus(self):
-        """
-        Team 1 has 2 player models.
-        - Master: "shiny 1"
-        - Player 1: "gold" -> "gold"
-        - Player 2: "diamond" -> "gold"
-        - Judge: "gold"
-        """
-        print("\n--- Testing Multi-Player Consensus ---")
-        
-        mock_p1 = MagicMock()
-        mock_p2 = MagicMock()
-        
-        # P1 responses
-        mock_p1.generate_player_action.side_effect = [
-            (PlayerActionMessage(guesses=["gold"]), "Thought: gold is shiny"), # Round 1
-            (PlayerActionMessage(guesses=["gold"]), "Refined: gold still shiny") # Round 2
-        ]
-        
-        # P2 responses
-        mock_p2.generate_player_action.side_effect = [
-            (PlayerActionMessage(guesses=["diamond"]), "Thought: diamond is shiny"), # Round 1
-            (PlayerActionMessage(guesses=["gold"]), "Refined: gold is better"), # Round 2
-            (PlayerActionMessage(guesses=["gold"]), "Judge: Consensus is gold") # Judge
-        ]
-        
-        self.orch.teams[1]["player_models"] = [mock_p1, mock_p2]
-        mock_master = self.orch.teams[1]["master_model"]
-        
-        # Note: If reusing mock_master from setUp, reset it or overwrite return value
-        mock_master.generate_master.return_value = (
-            MasterActionMessage(hint_word="shiny", hint_number=1),
-            "Hint: shiny 1"
+# Player response sequences (Round 1, Round 2[, Judge]) for the CrossTalk scenarios
+_P1_GOLD = (
+    (MSG_GOLD, "Thought: gold is shiny"),
+    (MSG_GOLD, "Refined: gold still shiny")
+)
+_P2_SWITCHES_TO_GOLD = (
+    (MSG_DIAMOND, "Thought: diamond is shiny"),
+    (MSG_GOLD, "Refined: gold is better")
+)
+_P2_DIAMOND_THEN_JUDGES_GOLD = (
+    (MSG_DIAMOND, "Thought: diamond is shiny"),
+    (MSG_DIAMOND, "Refined: diamond still shiny"),
+    (MSG_GOLD, "Judge: gold is safer")
+)
+_MAJORITY_RESPONSES = (
+    ((MSG_GOLD, "Thought: gold"), (MSG_GOLD, "Thought: gold")),
+    ((MSG_DIAMOND, "Thought: diamond"), (MSG_GOLD, "Thought: gold")),
+    ((MSG_DIAMOND, "Thought: diamond"), (MSG_DIAMOND, "Thought: diamond"))
+)
+
+
+def run_and_extract(orch, team_id=None):
+    """
+    Play one team's turn (or a full step when team_id is None, reading team 1's log
+    from orchestration_log) and return the fields the scenarios assert on.
+    """
+    if team_id is None:
+        orch.step()
+        log = orch.orchestration_log[-1]['team_logs'][1]
+    else:
+        log = orch.team_step(team_id)
+    player_result = log['player_result']['result'] if log['player_result'] else {}
+    return SimpleNamespace(
+        log=log,
+        error=log['error'],
+        success=log['success'],
+        master_prompt=str(log['master_prompt']),
+        master_action=log['master_action'],
+        player_prompt=str(log['player_prompt']),
+        results=player_result.get('results', []),
+        correct_count=player_result.get('correct_count'),
+    )
+
+
+def test_full_step_execution(scenario, mock_team):
+    print("\n--- Testing Standard Orchestrator Step ---")
+    env, orch = scenario(teams=1)
+
+    # Mock Responses
+    master, players = mock_team(
+        (MSG_PRECIOUS_2, "HINT: 'precious' NUMBER: 2"),
+        [[(MSG_GOLD_DIAMOND, '{"guesses": ["gold", "diamond"]}')]]
+    )
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+
+    r = run_and_extract(orch)
+
+    # Assert specific logs
+    assert "gold" in r.master_prompt
+    assert "diamond" in r.master_prompt
+
+    assert r.master_action['hint_word'] == "precious"
+    assert r.master_action['hint_number'] == 2
+
+    assert "precious" in r.player_prompt
+
+    assert r.correct_count == 2
+    assert r.success == True
+
+    assert {"gold", "diamond"} <= set(env.guessed_words)
+
+
+@pytest.mark.parametrize("team_id,hint,number,guesses,correct_count", [
+    (1, "shiny", 1, ["gold"], 1),
+    # Team 2 hits its own word, then the opponent's
+    (2, "liquid", 2, ["water", "gold"], 1),
+])
+def test_team_step(scenario, mock_team, team_id, hint, number, guesses, correct_count):
+    print(f"\n--- Testing Multiteam Orchestrator Team {team_id} ---")
+    env, orch = scenario(teams=2)
+
+    master, players = mock_team(
+        (MasterActionMessage(hint_word=hint, hint_number=number), f"HINT: {hint} NUMBER: {number}"),
+        [[(PlayerActionMessage(guesses=guesses), json.dumps({"guesses": guesses}))]]
+    )
+    orch.teams[team_id]["master_model"] = master
+    orch.teams[team_id]["player_models"] = players
+
+    r = run_and_extract(orch, team_id)
+
+    assert r.master_action['hint_word'] == hint
+    assert [res['word'] for res in r.results] == guesses
+    assert r.correct_count == correct_count
+
+    assert set(guesses) <= set(env.guessed_words)
+
+
+def test_team1_turn_ends_on_miss(scenario, mock_team):
+    print("\n--- Testing Multiteam Orchestrator Team 1 (Turn Ends On Miss) ---")
+    env, orch = scenario(teams=2)
+
+    master, players = mock_team(
+        (MSG_METAL_3, "HINT: metal NUMBER: 3"),
+        [[(MSG_GOLD_DOOR_DIAMOND, '{"guesses": ["gold", "door", "diamond"]}')]]
+    )
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+
+    r = run_and_extract(orch, 1)
+
+    assert [res['result'] for res in r.results] == ["correct", "neutral"]
+    assert r.correct_count == 1
+    assert "diamond" not in env.guessed_words
+
+
+@pytest.mark.slow
+def test_multi_player_consensus(scenario, mock_team):
+    """
+    Team 1 has 2 player models.
+    - Master: "shiny 1"
+    - Player 1: "gold" -> "gold"
+    - Player 2: "diamond" -> "gold"
+    - Round 2 is unanimous, so the judge is skipped
+    """
+    print("\n--- Testing Multi-Player Consensus ---")
+    _, orch = scenario(teams=2)
+
+    master, players = mock_team(
+        (MSG_SHINY_1, "Hint: shiny 1"),
+        [_P1_GOLD, _P2_SWITCHES_TO_GOLD]
+    )
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+
+    r = run_and_extract(orch, 1)
+
+    # Assert SUCCESS first
+    assert r.error == "", f"Step failed with error: {r.error}"
+
+    # Verify Results
+    assert r.correct_count == 1
+    assert r.results[0]['word'] == "gold"
+
+    # Verify Model Calls
+    assert players[0].calls == 2
+    assert players[1].calls == 2
+
+
+@pytest.mark.slow
+def test_multi_player_judge(scenario, mock_team):
+    """
+    Round 2 still disagrees, so the judge (last player model) decides.
+    - Player 1: "gold" -> "gold"
+    - Player 2: "diamond" -> "diamond"
+    - Judge: "gold"
+    """
+    _, orch = scenario(teams=2)
+    master, players = mock_team(
+        (MSG_SHINY_1, "Hint: shiny 1"),
+        [_P1_GOLD, _P2_DIAMOND_THEN_JUDGES_GOLD]
+    )
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+
+    r = run_and_extract(orch, 1)
+
+    assert r.error == "", f"Step failed with error: {r.error}"
+    assert r.results[0]['word'] == "gold"
+    assert players[0].calls == 2
+    assert players[1].calls == 3
+
+
+@pytest.mark.slow
+def test_multi_player_majority(scenario, mock_team):
+    """
+    Two of three players agree after Round 2, so the majority answer is taken without a judge.
+    - Player 1: "gold" -> "gold"
+    - Player 2: "diamond" -> "gold"
+    - Player 3: "diamond" -> "diamond"
+    """
+    _, orch = scenario(teams=2)
+    master, players = mock_team((MSG_SHINY_1, "Hint: shiny 1"), _MAJORITY_RESPONSES)
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+
+    r = run_and_extract(orch, 1)
+
+    assert r.error == "", f"Step failed with error: {r.error}"
+    assert r.results[0]['word'] == "gold"
+    for player in players:
+        assert player.calls == 2
+
+
+def test_reconstruct_state_matches_environment(scenario, mock_team):
+    env, orch = scenario(teams=2)
+    for team_id, guesses in ((1, ("gold", "diamond")), (2, ("wheat", "door"))):
+        master, players = mock_team(
+            (MSG_SHINY_1, "HINT: shiny NUMBER: 1"),
+            [[(PlayerActionMessage(guesses=[guess]), "") for guess in guesses]]
         )
-        
-        step_result = self.orch.team_step(1)
-        
-        # Assert SUCCESS first
-        self.assertEqual(step_result['error'], "", f"Step failed with error: {step_result['error']}")
-        
-        # Verify Results
-        p_result = step_result['player_result']
-        self.assertEqual(p_result['result']['correct_count'], 1)
-        self.assertEqual(p_result['result']['results'][0]['word'], "gold")
-        
-        # Verify Model Calls
-        self.assertEqual(mock_p1.generate_player_action.call_count, 2)
-        self.assertEqual(mock_p2.generate_player_action.call_count, 3)
-
-if __name__ == "__main__":
-    unittest.main()
+        orch.teams[team_id]["master_model"] = master
+        orch.teams[team_id]["player_models"] = players
+
+    states = []
+    for _ in range(2):
+        orch.step()
+        states.append(env.get_game_state())
+
+    for step, state in enumerate(states, start=1):
+        assert orch.reconstruct_state(step) == state
+
+
+def test_reconstruct_state_needs_kept_steps(scenario, mock_team, tmp_path):
+    _, orch = scenario(teams=1)
+    master, players = mock_team((MSG_SHINY_1, "HINT: shiny NUMBER: 1"), [[(MSG_GOLD, "")]])
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+
+    orch.open_step_log(tmp_path / "steps.ndjson", keep_steps=False)
+    orch.step()
+    orch.close_step_log()
+
+    assert orch.orchestration_log == []
+    with pytest.raises(RuntimeError):
+        orch.reconstruct_state(1)
+
+
+def test_run_episode_reward_log_pairs(scenario, mock_team):
+    _, orch = scenario(teams=1)
+    master, players = mock_team((MSG_SHINY_1, "HINT: shiny NUMBER: 1"), [[(MSG_GOLD, "")]])
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+
+    result = orch.run_episode(limit=1)
+
+    # One [master, player] pair per step, as the run logs store them
+    assert result["reward_log"] == {1: [[5, 5]]}
+
+
+class _BarrierMaster:
+    """Master that waits for the other games' masters before answering."""
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+
+    def generate_master(self, *args, **kwargs):
+        self.barrier.wait()
+        return MSG_SHINY_1, "HINT: shiny NUMBER: 1"
+
+
+def test_run_episodes_plays_games_concurrently(scenario, mock_team):
+    # Each master blocks until both games reach it, so sequential play would break the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    orchestrators = []
+    for _ in range(2):
+        _, orch = scenario(teams=1)
+        _, players = mock_team(None, [[(PlayerActionMessage(guesses=["gold", "diamond", "emerald"]), "")]])
+        orch.teams[1]["master_model"] = _BarrierMaster(barrier)
+        orch.teams[1]["player_models"] = players
+        orchestrators.append(orch)
+
+    results = run_episodes(orchestrators, limit=1, max_workers=2)
+
+    assert [r["winner"] for r in results] == [1, 1]
+    for orch in orchestrators:
+        assert orch.orchestration_log[0]["team_logs"][1]["error"] == ""
+
+
+def _replay_step_log(path):
+    """Replay an NDJSON step log, returning (board, guessed_words) after its last line."""
+    board, guessed = None, []
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if "state" in record:
+                board, guessed = record["state"]["board"], list(record["state"]["guessed_words"])
+            else:
+                guessed.extend(record["new_guesses"])
+    return board, guessed
+
+
+def test_step_log_replays_across_reset(scenario, mock_team, tmp_path):
+    _, orch = scenario(teams=1)
+    path = tmp_path / "steps.ndjson"
+    orch.open_step_log(path)
+    master, players = mock_team((MSG_SHINY_1, "HINT: shiny NUMBER: 1"), [[(MSG_GOLD, "")]])
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+    orch.step()
+
+    # reset() adopts this second environment, laid out differently
+    env, _ = scenario(teams=1)
+    env.board = list(reversed(env.board))
+    orch.reset()
+    _, players = mock_team(None, [[(MSG_DIAMOND, "")]])
+    orch.teams[1]["player_models"] = players
+    orch.step()
+    orch.close_step_log()
+
+    board, guessed = _replay_step_log(path)
+    assert board == list(env.board)
+    assert guessed == ["diamond"]
+
+
+def test_astep_matches_step(scenario, mock_team):
+    env, orch = scenario(teams=1)
+    master, players = mock_team((MSG_SHINY_1, "HINT: shiny NUMBER: 1"), [[(MSG_GOLD, "")]])
+    orch.teams[1]["master_model"] = master
+    orch.teams[1]["player_models"] = players
+
+    log = asyncio.run(orch.astep())
+
+    assert log is orch.orchestration_log[-1]
+    assert log["step"] == 1
+    assert log["new_guesses"] == ["gold"]
+    assert env.guessed_words == ["gold"]
+
+
+def test_run_log_matches_without_orjson(scenario, mock_team, monkeypatch, tmp_path):
+    if Orchestrator.orjson is None:
+        pytest.skip("orjson is not available")
+    _, orch = scenario(teams=2)
+    for team_id in (1, 2):
+        master, players = mock_team((MSG_SHINY_1, "HINT: shiny NUMBER: 1"), [[(MSG_GOLD, "Thought: café")]])
+        orch.teams[team_id]["master_model"] = master
+        orch.teams[team_id]["player_models"] = players
+    orch.step()
+
+    step_line = Orchestrator._dumps_line(orch.orchestration_log[-1])
+    orch.save_run_log(tmp_path / "orjson.json", "run-é")
+    monkeypatch.setattr(Orchestrator, "orjson", None)
+    orch.save_run_log(tmp_path / "json.json", "run-é")
+
+    assert (tmp_path / "json.json").read_bytes() == (tmp_path / "orjson.json").read_bytes()
+    assert Orchestrator._dumps_line(orch.orchestration_log[-1]) == step_line
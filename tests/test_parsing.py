@@ -0,0 +1,59 @@
+import pytest
+
+from models._parsing import parse_master_response, parse_player_discussion, parse_player_response
+
+
+@pytest.mark.parametrize("response,guesses", [
+    ('<RESULT>{"guesses": ["gold", "diamond"]}</RESULT>', ["gold", "diamond"]),
+    ('text {"guesses": ["gold"]} more', ["gold"]),
+    # The first "guesses" is prose; the object comes after it
+    ('My "guesses" are below.\n{"guesses": ["gold"]}', ["gold"]),
+    ('<RESULT>I stand by my "guesses": {"guesses": ["gold"]}</RESULT>', ["gold"]),
+    # Braces inside strings and nested objects do not end the object early
+    ('<RESULT>{"guesses": ["gold"], "why": "a } b {", "meta": {"n": 1}}</RESULT>', ["gold"]),
+    ('<RESULT>Here: {"note": "use } carefully", "guesses": ["apple"]}</RESULT>', ["apple"]),
+    ('<RESULT>{"why": "a { b", "meta": {"n": 1}, "guesses": ["gold"]}</RESULT>', ["gold"]),
+])
+def test_parse_player_response(response, guesses):
+    assert parse_player_response(response).guesses == guesses
+
+
+@pytest.mark.parametrize("response", [
+    "", "no json", "Error querying Ollama: boom", '<RESULT>{"guesses": ["gold"</RESULT>', "[1, 2]",
+])
+def test_parse_player_response_rejects(response):
+    assert parse_player_response(response) is None
+
+
+def test_parse_player_discussion_skips_thought_mentions():
+    # No RESULT block, and the THOUGHT mentions "guesses" before the real object
+    response = '<THOUGHT>Their "guesses" were wrong, so gold.</THOUGHT>\n{"guesses": ["gold"]}'
+    message = parse_player_discussion(response)
+    assert message.response == 'Their "guesses" were wrong, so gold.'
+    assert message.guesses == ["gold"]
+
+
+def test_parse_player_discussion_prefers_result_block():
+    response = '<THOUGHT>{"guesses": ["iron"]}</THOUGHT><RESULT>{"guesses": ["gold"]}</RESULT>'
+    assert parse_player_discussion(response).guesses == ["gold"]
+
+
+@pytest.mark.parametrize("response,hint", [
+    ("<THOUGHT>x</THOUGHT>\n<RESULT>\nHINT: fruit NUMBER: 2\n</RESULT>", ("fruit", 2)),
+    ("HINT: \"sea-side\" NUMBER: 1", ("sea-side", 1)),
+])
+def test_parse_master_response(response, hint):
+    message = parse_master_response(response)
+    assert (message.hint_word, message.hint_number) == hint
+
+
+def test_parse_master_response_without_hint():
+    assert parse_master_response("nothing") is None
+
+
+def test_parse_master_response_logs_oversized_number(caplog):
+    # More digits than int() will convert
+    response = "HINT: gold NUMBER: " + "9" * 5000
+    with caplog.at_level("WARNING", logger="models._parsing"):
+        assert parse_master_response(response) is None
+    assert "Exception during Master parsing" in caplog.text
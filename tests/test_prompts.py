@@ -0,0 +1,15 @@
+import pytest
+
+from messages.Message import PlayerStateMessage
+from prompts import agent_prompts
+
+
+def test_state_json_matches_without_orjson(monkeypatch):
+    if agent_prompts.orjson is None:
+        pytest.skip("orjson is not available")
+    state = PlayerStateMessage(hint_word="café", hint_number=2, board=("crème", "gold", "日本"), guessed_words_log=())
+    with_orjson = agent_prompts._dumps_state(state.to_dict())
+
+    monkeypatch.setattr(agent_prompts, "orjson", None)
+    assert agent_prompts._dumps_state(state.to_dict()) == with_orjson
+    assert "café" in with_orjson
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+import requests
+
+from configs.Configs import VLLMConfig
+from models.VLLMAgent import VLLMAgent
+
+
+class FakeResponse:
+    def __init__(self, body, status=200):
+        self.content = json.dumps(body).encode() if not isinstance(body, bytes) else body
+        self.status = status
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status} Server Error")
+
+
+class FakeSession:
+    """Answers each post with the next response, recording the payloads."""
+
+    def __init__(self, responses):
+        self.responses = iter(responses)
+        self.payloads = []
+
+    def post(self, url, json=None, **kwargs):
+        self.payloads.append(json)
+        return next(self.responses)
+
+
+def _choices(*texts_by_index):
+    return {"choices": [{"index": i, "text": text} for i, text in texts_by_index]}
+
+
+@pytest.fixture
+def vllm(monkeypatch):
+    """Factory for a VLLMAgent whose session serves the given responses."""
+    def _make(responses, cache_size=0):
+        agent = VLLMAgent(VLLMConfig(model="stub", vllm_url="http://stub/v1/completions", max_tokens=64, cache_size=cache_size))
+        session = FakeSession(responses)
+        monkeypatch.setattr(agent, "_session", session)
+        return agent, session
+    return _make
+
+
+def test_query_payload_stops_after_result_block(vllm):
+    agent, session = vllm([FakeResponse(_choices((0, "<RESULT>HINT: gold NUMBER: 2</RESULT>")))])
+    assert agent._query("prompt") == "<RESULT>HINT: gold NUMBER: 2</RESULT>"
+    payload = session.payloads[0]
+    assert payload["prompt"] == "prompt"
+    assert payload["max_tokens"] == 64
+    assert payload["stop"] == ["</RESULT>"]
+    assert payload["include_stop_str_in_output"] is True
+
+
+def test_query_batch_orders_choices_by_index(vllm):
+    agent, session = vllm([FakeResponse(_choices((2, "c"), (0, "a"), (1, "b")))])
+    assert agent._query_batch(["pa", "pb", "pc"]) == ["a", "b", "c"]
+    # One request carrying every prompt
+    assert [p["prompt"] for p in session.payloads] == [["pa", "pb", "pc"]]
+
+
+def test_query_batch_with_cache_queries_each_prompt(vllm):
+    agent, session = vllm([FakeResponse(_choices((0, "a"))), FakeResponse(_choices((0, "b")))], cache_size=4)
+    assert sorted(agent._query_batch(["pa", "pb"])) == ["a", "b"]
+    assert sorted(p["prompt"] for p in session.payloads) == ["pa", "pb"]
+
+
+@pytest.mark.parametrize("response", [
+    FakeResponse({"error": "overloaded"}, status=503),
+    FakeResponse({"object": "error"}),
+    FakeResponse(b"not json"),
+])
+def test_error_response_returns_error_strings(vllm, response):
+    agent, _ = vllm([response, response])
+    assert agent._query("prompt").startswith("Error querying vLLM")
+    assert all(r.startswith("Error querying vLLM") for r in agent._query_batch(["pa", "pb"]))